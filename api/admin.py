@@ -15,6 +15,7 @@ admin.site.register(models.CartOrder)
 admin.site.register(models.CartOrderItem)
 admin.site.register(models.Certificate)
 admin.site.register(models.CompletedLesson)
+admin.site.register(models.PlaybackPosition)
 admin.site.register(models.EnrolledCourse)
 admin.site.register(models.Note)
 admin.site.register(models.Review)
@@ -22,3 +23,5 @@ admin.site.register(models.Notification)
 admin.site.register(models.Coupon)
 admin.site.register(models.Wishlist)
 admin.site.register(models.Country)
+admin.site.register(models.CourseStats)
+admin.site.register(models.CourseDailyRevenue)
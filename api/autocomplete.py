@@ -0,0 +1,141 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left
+
+from django.db import models
+from django.db.models.functions import Coalesce
+
+from api import models as api_models
+from api.cache import get_version
+
+AUTOCOMPLETE_VERSION = "autocomplete"
+AUTOCOMPLETE_MAX_AGE = 600  # seconds; popularity weights are refreshed at least this often
+AUTOCOMPLETE_LIMIT = 8
+AUTOCOMPLETE_MAX_LIMIT = 20
+
+
+def normalize(text):
+    return " ".join((text or "").lower().split())
+
+
+class PrefixIndex:
+    """
+    In-memory prefix index over suggestion entries.
+
+    Every word start of an entry is a key in a sorted array, so the keys matching a prefix
+    form one contiguous range found with bisect. Entries are ranked by weight, and a sparse
+    table answers "best ranked entry in a key range" in O(1), so the top N of any range is
+    read in O(N log N) no matter how many keys match.
+    """
+
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=lambda entry: -entry["weight"])
+        keys = []
+        for rank, entry in enumerate(self.entries):
+            text = normalize(entry["text"])
+            starts = {0} | {index + 1 for index, char in enumerate(text) if char == " "}
+            keys.extend((text[start:], rank) for start in starts)
+        keys.sort()
+        self.keys = [key for key, _ in keys]
+        self.ranks = [rank for _, rank in keys]
+
+        # best[level][i] is the index of the best ranked key in keys[i:i + 2 ** level].
+        self.best = [list(range(len(self.ranks)))]
+        level = 1
+        while 1 << level <= len(self.ranks):
+            previous = self.best[-1]
+            half = 1 << (level - 1)
+            self.best.append([
+                self._better(previous[i], previous[i + half])
+                for i in range(len(self.ranks) - (1 << level) + 1)
+            ])
+            level += 1
+
+    def lookup(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + "\uffff", lo=start) - 1
+
+        results = []
+        seen = set()
+        heap = []
+        self._push(heap, start, end)
+        while heap and len(results) < limit:
+            rank, index, low, high = heapq.heappop(heap)
+            if rank not in seen:
+                seen.add(rank)
+                results.append(self.entries[rank])
+            self._push(heap, low, index - 1)
+            self._push(heap, index + 1, high)
+        return results
+
+    def _better(self, left, right):
+        return left if self.ranks[left] <= self.ranks[right] else right
+
+    def _push(self, heap, low, high):
+        if low > high:
+            return
+        level = (high - low + 1).bit_length() - 1
+        index = self._better(self.best[level][low], self.best[level][high - (1 << level) + 1])
+        heapq.heappush(heap, (self.ranks[index], index, low, high))
+
+
+def build_entries():
+    """
+    Suggestions for published courses, active categories and teachers with published courses,
+    weighted by enrollments (categories and teachers sum the enrollments of their courses).
+    """
+    enrollments = Coalesce(models.F("stats__enrollment_count"), 0)
+    courses = api_models.Course.objects.published()
+
+    entries = [
+        {"type": "course", "text": course["title"], "slug": course["slug"], "weight": course["weight"]}
+        for course in courses.annotate(weight=enrollments).values("title", "slug", "weight")
+    ]
+    entries += [
+        {"type": "category", "text": category["title"], "slug": category["slug"], "weight": category["weight"] or 0}
+        for category in api_models.Category.objects.filter(active=True).annotate(
+            weight=models.Sum(
+                "course__stats__enrollment_count",
+                filter=models.Q(course__platform_status="Published", course__teacher_status="Published"),
+            )
+        ).values("title", "slug", "weight")
+    ]
+    entries += [
+        {"type": "teacher", "text": teacher["teacher__full_name"], "id": teacher["teacher"], "weight": teacher["weight"] or 0}
+        for teacher in courses.filter(teacher__isnull=False).values("teacher", "teacher__full_name").annotate(
+            weight=models.Sum(enrollments)
+        )
+    ]
+    return entries
+
+
+_index = None
+_index_version = None
+_index_built = 0
+_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Returns the process-wide index, rebuilding it when the autocomplete version was bumped
+    (see api/signals.py) or when it is older than AUTOCOMPLETE_MAX_AGE.
+    """
+    global _index, _index_version, _index_built
+    version = get_version(AUTOCOMPLETE_VERSION)
+    if _index is not None and _index_version == version and time.monotonic() - _index_built < AUTOCOMPLETE_MAX_AGE:
+        return _index
+    with _lock:
+        if _index is None or _index_version != version or time.monotonic() - _index_built >= AUTOCOMPLETE_MAX_AGE:
+            _index = PrefixIndex(build_entries())
+            _index_version = version
+            _index_built = time.monotonic()
+    return _index
+
+
+def suggest(query, limit=AUTOCOMPLETE_LIMIT):
+    limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+    return get_index().lookup(query, limit)
@@ -0,0 +1,157 @@
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from rest_framework.response import Response
+
+CATEGORY_LIST_VERSION = "category_list"
+CATEGORY_LIST_TIMEOUT = 60 * 60
+
+
+# Versioned cache namespaces: every key built with versioned_key(name, ...) embeds the
+# current version of `name`, so bumping the version invalidates all of them at once.
+
+def version_key(name):
+    return f"api:version:{name}"
+
+
+def get_version(name):
+    version = cache.get(version_key(name))
+    if version is None:
+        cache.add(version_key(name), 1, timeout=None)
+        version = cache.get(version_key(name), 1)
+    return version
+
+
+def bump_version(*names):
+    for name in names:
+        try:
+            cache.incr(version_key(name))
+        except ValueError:
+            cache.add(version_key(name), 2, timeout=None)
+
+
+def versioned_key(name, *parts):
+    return ":".join(["api", name, str(get_version(name)), *[str(part) for part in parts]])
+
+
+# Per-student dashboard summary
+
+STUDENT_SUMMARY_TIMEOUT = 60
+
+
+def student_version(user_id):
+    return f"student:{user_id}"
+
+
+# Per-teacher dashboard summary
+
+TEACHER_SUMMARY_TIMEOUT = 60
+
+
+def teacher_version(teacher_id):
+    return f"teacher:{teacher_id}"
+
+
+# Response cache for the public catalog endpoints
+
+CATALOG_VERSION = "catalog"
+RESPONSE_CACHE_TIMEOUT = 60 * 5
+RESPONSE_MAX_AGE = 60
+RESPONSE_STATS_KEY = "api:response-cache:stats"
+
+
+def course_version(slug):
+    return f"course:{slug}"
+
+
+def category_version(slug):
+    return f"category:{slug}"
+
+
+def record_response_cache(view_name, event):
+    for key in (f"{RESPONSE_STATS_KEY}:{event}", f"{RESPONSE_STATS_KEY}:{view_name}:{event}"):
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, 1, timeout=None):
+                cache.incr(key)
+
+
+def response_cache_stats(view_names):
+    """
+    Hit/miss/not-modified counters, overall and per view.
+    """
+    events = ("hit", "miss", "not_modified")
+    names = ["total", *view_names]
+    keys = {
+        (name, event): f"{RESPONSE_STATS_KEY}:{event}" if name == "total" else f"{RESPONSE_STATS_KEY}:{name}:{event}"
+        for name in names for event in events
+    }
+    values = cache.get_many(list(keys.values()))
+    stats = {}
+    for (name, event), key in keys.items():
+        stats.setdefault(name, {})[event] = values.get(key, 0)
+    for counters in stats.values():
+        requests = counters["hit"] + counters["miss"]
+        counters["hit_ratio"] = round(counters["hit"] / requests, 4) if requests else None
+    return stats
+
+
+class CachedResponseMixin:
+    """
+    Caches the serialized body of GET responses and answers conditional requests.
+
+    The cache key embeds the request URL and the current version of every name returned by
+    get_cache_versions(), so bumping one of those versions (see api/signals.py) invalidates
+    the affected responses. The ETag is a hash of the response body, and a matching
+    If-None-Match is answered with 304 Not Modified.
+    """
+    cache_versions = (CATALOG_VERSION,)
+    cache_timeout = RESPONSE_CACHE_TIMEOUT
+    cache_max_age = RESPONSE_MAX_AGE
+
+    def get_cache_versions(self):
+        return list(self.cache_versions)
+
+    def get_cache_key(self, request):
+        versions = ",".join(f"{name}={get_version(name)}" for name in self.get_cache_versions())
+        raw = "|".join([request.get_host(), request.get_full_path(), versions])
+        return f"api:response:{hashlib.md5(raw.encode('utf-8')).hexdigest()}"
+
+    def get(self, request, *args, **kwargs):
+        view_name = type(self).__name__
+        key = self.get_cache_key(request)
+        cached = cache.get(key)
+
+        if cached is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200 or not isinstance(response, Response):
+                return response
+            body = json.dumps(response.data, cls=DjangoJSONEncoder, sort_keys=True)
+            cached = {"data": json.loads(body), "etag": f'"{hashlib.md5(body.encode("utf-8")).hexdigest()}"'}
+            cache.set(key, cached, self.cache_timeout)
+            event = "miss"
+        else:
+            event = "hit"
+
+        record_response_cache(view_name, event)
+        if self.etag_matches(request, cached["etag"]):
+            response = Response(status=304)
+            record_response_cache(view_name, "not_modified")
+        else:
+            response = Response(cached["data"])
+
+        response["ETag"] = cached["etag"]
+        response["Cache-Control"] = f"public, max-age={self.cache_max_age}"
+        return response
+
+    @staticmethod
+    def etag_matches(request, etag):
+        header = request.META.get("HTTP_IF_NONE_MATCH")
+        if not header:
+            return False
+        candidates = [value.strip().removeprefix("W/") for value in header.split(",")]
+        return "*" in candidates or etag in candidates
@@ -0,0 +1,135 @@
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageDraw, ImageFont
+
+from api import models as api_models
+from api.cache import bump_version, student_version
+
+# Certificates are issued when an enrollment reaches 100% completion and rendered to PNG and PDF
+# by a background thread pool, never in the request. The files are stored once under
+# certificates/<certificate_id>.<format> and served from MEDIA_URL like any other upload.
+
+CERTIFICATE_FORMATS = ("png", "pdf")
+CERTIFICATE_SIZE = (1600, 1130)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def certificate_path(certificate_id, extension):
+    return f"certificates/{certificate_id}.{extension}"
+
+
+def certificate_files(certificate):
+    if certificate.rendered_at is None:
+        return {}
+    return {extension: default_storage.url(certificate_path(certificate.certificate_id, extension)) for extension in CERTIFICATE_FORMATS}
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = getattr(settings, "CERTIFICATE_RENDER_WORKERS", 2)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="certificate-render")
+    return _executor
+
+
+def draw_certificate(certificate):
+    image = Image.new("RGB", CERTIFICATE_SIZE, "white")
+    draw = ImageDraw.Draw(image)
+    width, height = CERTIFICATE_SIZE
+    draw.rectangle([30, 30, width - 30, height - 30], outline="#1f3b73", width=12)
+
+    lines = [
+        ("Certificate of Completion", 72, 220),
+        ("This certifies that", 36, 380),
+        (certificate.user.full_name if certificate.user else "", 64, 460),
+        ("has successfully completed", 36, 580),
+        (certificate.course.title or "", 56, 660),
+        (f"Instructor: {certificate.course.teacher.full_name}" if certificate.course.teacher else "", 32, 800),
+        (f"Issued {certificate.date:%B %d, %Y} - Certificate #{certificate.certificate_id}", 28, 960),
+    ]
+    for text, size, top in lines:
+        font = ImageFont.load_default(size=size)
+        draw.text((width / 2, top), text, fill="#1f3b73", font=font, anchor="mm")
+    return image
+
+
+def render_certificate(certificate_id):
+    """
+    Renders the PNG and PDF of a certificate unless they already exist, and marks it as rendered.
+    """
+    certificate = api_models.Certificate.objects.select_related("user", "course__teacher").filter(
+        certificate_id=certificate_id
+    ).first()
+    if certificate is None:
+        return False
+
+    image = None
+    for extension in CERTIFICATE_FORMATS:
+        path = certificate_path(certificate_id, extension)
+        if default_storage.exists(path):
+            continue
+        image = image or draw_certificate(certificate)
+        buffer = io.BytesIO()
+        image.save(buffer, format=extension.upper(), resolution=150)
+        default_storage.save(path, ContentFile(buffer.getvalue()))
+
+    if certificate.rendered_at is None:
+        api_models.Certificate.objects.filter(pk=certificate.pk).update(rendered_at=timezone.now())
+    return True
+
+
+def render_in_worker(certificate_id):
+    close_old_connections()
+    try:
+        return render_certificate(certificate_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_render(certificate_ids):
+    """
+    Queues the rendering of the given certificates on the worker pool once the current transaction commits.
+    """
+    certificate_ids = list(certificate_ids)
+    if certificate_ids:
+        transaction.on_commit(lambda: [get_executor().submit(render_in_worker, certificate_id) for certificate_id in certificate_ids])
+
+
+def issue_certificates(enrollments, render=True):
+    """
+    Creates the missing certificates of the given enrollments that are 100% complete.
+    Returns the new certificates.
+    """
+    enrollments = [enrollment for enrollment in enrollments if enrollment.user_id and enrollment.course_id]
+    progress = api_models.EnrolledCourse.compute_progress(enrollments)
+    completed = {
+        (enrollment.user_id, enrollment.course_id)
+        for enrollment in enrollments
+        if progress[enrollment.id]["total_lessons"] and progress[enrollment.id]["percent"] >= 100
+    }
+    if not completed:
+        return []
+
+    existing = set(api_models.Certificate.objects.filter(
+        user_id__in={user_id for user_id, _ in completed},
+        course_id__in={course_id for _, course_id in completed},
+    ).values_list("user_id", "course_id"))
+    certificates = api_models.Certificate.objects.bulk_create(
+        [api_models.Certificate(user_id=user_id, course_id=course_id) for user_id, course_id in completed - existing],
+        ignore_conflicts=True,
+    )
+    # bulk_create() sends no post_save, so the student summaries are invalidated here.
+    bump_version(*{student_version(certificate.user_id) for certificate in certificates})
+    if render:
+        schedule_render(certificate.certificate_id for certificate in certificates)
+    return certificates
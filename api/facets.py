@@ -0,0 +1,167 @@
+import hashlib
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.core.cache import cache
+from django.db import models
+
+from rest_framework.exceptions import ValidationError
+
+from api import models as api_models
+from api.cache import versioned_key
+
+COURSE_FACETS_VERSION = "course_facets"
+COURSE_FACETS_TIMEOUT = 60 * 5
+
+# (value, label, lower bound inclusive, upper bound exclusive)
+PRICE_RANGES = (
+    ("free", "Free", None, Decimal("0.01")),
+    ("0-20", "Under $20", Decimal("0.01"), Decimal("20")),
+    ("20-50", "$20 - $50", Decimal("20"), Decimal("50")),
+    ("50-100", "$50 - $100", Decimal("50"), Decimal("100")),
+    ("100+", "$100 and more", Decimal("100"), None),
+)
+
+# Minimum average rating of each bucket ("4 stars & up", ...).
+RATING_BUCKETS = (4, 3, 2, 1)
+
+FACET_NAMES = ("category", "level", "language", "price", "rating", "featured")
+
+
+def split_param(params, name):
+    return [value for value in params.get(name, "").split(",") if value]
+
+
+def parse_price(params, name):
+    # Decimal() also accepts NaN and Infinity, which the database layer rejects.
+    try:
+        value = Decimal(params[name])
+    except InvalidOperation:
+        value = None
+    if value is None or not value.is_finite():
+        raise ValidationError({name: "Expected a number."})
+    return value
+
+
+def price_range_q(lower, upper):
+    condition = models.Q()
+    if lower is not None:
+        condition &= models.Q(price__gte=lower)
+    if upper is not None:
+        condition &= models.Q(price__lt=upper)
+    return condition
+
+
+def parse_filters(params):
+    """
+    Turns the query parameters into one Q object per facet:
+
+    ?category=slug,slug  ?level=Beginner  ?language=English,French
+    ?price=free,0-20  ?price_min=10&price_max=50  ?rating=4  ?featured=true
+    """
+    filters = {}
+
+    categories = split_param(params, "category")
+    if categories:
+        filters["category"] = models.Q(category__slug__in=categories)
+
+    levels = split_param(params, "level")
+    if levels:
+        filters["level"] = models.Q(level__in=levels)
+
+    languages = split_param(params, "language")
+    if languages:
+        filters["language"] = models.Q(language__in=languages)
+
+    price = models.Q()
+    ranges = {value: (lower, upper) for value, _, lower, upper in PRICE_RANGES}
+    selected = [ranges[value] for value in split_param(params, "price") if value in ranges]
+    if selected:
+        for lower, upper in selected:
+            price |= price_range_q(lower, upper)
+    for name, lookup in (("price_min", "price__gte"), ("price_max", "price__lte")):
+        if params.get(name):
+            price &= models.Q(**{lookup: parse_price(params, name)})
+    if price:
+        filters["price"] = price
+
+    try:
+        rating = int(params.get("rating", 0))
+    except ValueError:
+        rating = 0
+    if rating:
+        filters["rating"] = models.Q(rating_average__gte=rating)
+
+    featured = params.get("featured", "").lower()
+    if featured in ("true", "1"):
+        filters["featured"] = models.Q(featured=True)
+    elif featured in ("false", "0"):
+        filters["featured"] = models.Q(featured=False)
+
+    return filters
+
+
+def combine(filters, exclude=None):
+    condition = models.Q()
+    for name, value in filters.items():
+        if name != exclude:
+            condition &= value
+    return condition
+
+
+def filter_courses(queryset, params):
+    """
+    Applies the facet filters to a queryset that has a `rating_average` annotation (e.g. `cards()`).
+    """
+    return queryset.filter(combine(parse_filters(params)))
+
+
+def facet_values():
+    """
+    The selectable values of each facet: (facet, value, label, Q).
+    """
+    categories = api_models.Category.objects.filter(active=True).values_list("slug", "title")
+    values = [("category", slug, title, models.Q(category__slug=slug)) for slug, title in categories]
+    values += [("level", value, label, models.Q(level=value)) for value, label in api_models.LEVEL]
+    values += [("language", value, label, models.Q(language=value)) for value, label in api_models.LANGUAGES]
+    values += [("price", value, label, price_range_q(lower, upper)) for value, label, lower, upper in PRICE_RANGES]
+    values += [("rating", star, f"{star} stars & up", models.Q(rating_average__gte=star)) for star in RATING_BUCKETS]
+    values += [("featured", flag, label, models.Q(featured=flag)) for flag, label in ((True, "Featured"), (False, "Not featured"))]
+    return values
+
+
+def compute_facets(params):
+    """
+    Counts every facet value in a single aggregate query over the published catalog.
+    Each count applies the filters of the other facets only, so selecting a level
+    still shows how many courses every other level would return.
+    """
+    filters = parse_filters(params)
+    values = facet_values()
+
+    aggregates = {
+        f"facet_{index}": models.Count("id", filter=combine(filters, exclude=facet) & condition)
+        for index, (facet, _, _, condition) in enumerate(values)
+    }
+    courses = api_models.Course.objects.published().annotate(
+        rating_average=api_models.rating_average_expression("stats__")
+    )
+    counts = courses.aggregate(**aggregates) if aggregates else {}
+
+    facets = {name: [] for name in FACET_NAMES}
+    for index, (facet, value, label, _) in enumerate(values):
+        facets[facet].append({"value": value, "label": label, "count": counts[f"facet_{index}"]})
+    return facets
+
+
+def course_facets(params):
+    """
+    Cached compute_facets(); the cache is invalidated by bumping COURSE_FACETS_VERSION (see api/signals.py).
+    """
+    normalized = json.dumps({name: params.get(name) for name in (*FACET_NAMES, "price_min", "price_max")}, sort_keys=True)
+    key = versioned_key(COURSE_FACETS_VERSION, hashlib.md5(normalized.encode("utf-8")).hexdigest())
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(params)
+        cache.set(key, facets, COURSE_FACETS_TIMEOUT)
+    return facets
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api import playback
+
+
+class Command(BaseCommand):
+    help = "Write the buffered lecture playback positions to the database (run it every few seconds, e.g. from cron)."
+
+    def handle(self, *args, **options):
+        written = playback.flush()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} playback position(s)."))
@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from api import models as api_models
+from api.certificates import render_in_worker, issue_certificates
+
+
+class Command(BaseCommand):
+    help = "Issue the missing certificates of fully completed enrollments and render every unrendered certificate."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=4, help="Number of certificates rendered in parallel.")
+        parser.add_argument("--no-render", action="store_true", help="Only create the certificate rows.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        enrollments = api_models.EnrolledCourse.objects.filter(
+            user__isnull=False, course__isnull=False
+        ).only("id", "user_id", "course_id").order_by("id")
+
+        issued = 0
+        last_id = 0
+        while True:
+            batch = list(enrollments.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            issued += len(issue_certificates(batch, render=False))
+            last_id = batch[-1].id
+        self.stdout.write(self.style.SUCCESS(f"Issued {issued} certificate(s)."))
+
+        if options["no_render"]:
+            return
+        certificate_ids = list(api_models.Certificate.objects.filter(rendered_at__isnull=True).values_list("certificate_id", flat=True))
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            rendered = sum(bool(result) for result in executor.map(render_in_worker, certificate_ids))
+        self.stdout.write(self.style.SUCCESS(f"Rendered {rendered} certificate(s)."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api import models as api_models
+
+
+class Command(BaseCommand):
+    help = "Delete the delta sync tombstones older than SyncTombstone.RETENTION."
+
+    def handle(self, *args, **options):
+        deleted = api_models.SyncTombstone.prune()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstone(s)."))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api import models as api_models
+
+
+class Command(BaseCommand):
+    help = "Rebuild the CourseStats counters from live aggregates, or check them with --check."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Only compare stored counters with live aggregates.")
+        parser.add_argument("--course", type=int, action="append", dest="course_ids", help="Limit to a course id (repeatable).")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        course_ids = options["course_ids"]
+
+        if not options["check"]:
+            rows = api_models.CourseStats.rebuild(course_ids=course_ids, batch_size=options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {len(rows)} course(s)."))
+            return
+
+        computed = api_models.CourseStats.compute(course_ids)
+        stored = {
+            row["course_id"]: row
+            for row in api_models.CourseStats.objects.filter(course_id__in=list(computed)).values(
+                "course_id", *api_models.CourseStats.COUNTER_FIELDS
+            )
+        }
+
+        mismatches = 0
+        for course_id, values in computed.items():
+            row = stored.get(course_id)
+            if row is None:
+                mismatches += 1
+                self.stdout.write(f"Course {course_id}: missing stats row")
+                continue
+            diff = {field: (row[field], value) for field, value in values.items() if row[field] != value}
+            if diff:
+                mismatches += 1
+                details = ", ".join(f"{field} stored={old} live={new}" for field, (old, new) in diff.items())
+                self.stdout.write(f"Course {course_id}: {details}")
+
+        if mismatches:
+            raise CommandError(f"{mismatches} of {len(computed)} course(s) have stale stats. Run without --check to rebuild.")
+        self.stdout.write(self.style.SUCCESS(f"Stats for {len(computed)} course(s) match live aggregates."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from api import models as api_models
+
+
+class Command(BaseCommand):
+    help = "Rebuild the CourseDailyRevenue rollup from the paid order items."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--teacher", type=int, action="append", dest="teacher_ids", help="Limit to a teacher id (repeatable).")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        rows = api_models.CourseDailyRevenue.rebuild(teacher_ids=options["teacher_ids"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} daily revenue row(s)."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from api.search import get_note_search_backend, get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the course and student note full-text search indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--index", choices=("courses", "notes"), help="Rebuild only one of the indexes.")
+
+    def handle(self, *args, **options):
+        indexes = {"courses": get_search_backend, "notes": get_note_search_backend}
+        for name, get_backend in indexes.items():
+            if options["index"] and options["index"] != name:
+                continue
+            backend = get_backend()
+            count = backend.rebuild(batch_size=options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} {name} with {type(backend).__name__}."))
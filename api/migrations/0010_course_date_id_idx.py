@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_alter_notification_type_alter_review_rating_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['-date', '-id'], name='course_date_id_idx'),
+        ),
+    ]
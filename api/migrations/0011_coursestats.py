@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_course_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('rating_1', models.PositiveIntegerField(default=0)),
+                ('rating_2', models.PositiveIntegerField(default=0)),
+                ('rating_3', models.PositiveIntegerField(default=0)),
+                ('rating_4', models.PositiveIntegerField(default=0)),
+                ('rating_5', models.PositiveIntegerField(default=0)),
+                ('enrollment_count', models.PositiveIntegerField(default=0)),
+                ('lecture_count', models.PositiveIntegerField(default=0)),
+                ('content_seconds', models.PositiveIntegerField(default=0)),
+                ('date', models.DateTimeField(auto_now=True)),
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='api.course')),
+            ],
+            options={
+                'verbose_name_plural': 'Course Stats',
+            },
+        ),
+    ]
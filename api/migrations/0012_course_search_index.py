@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+SQLITE_CREATE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS api_course_search USING fts5(
+    title, description, category, teacher, lectures,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS api_course_search ("
+    " course_id bigint PRIMARY KEY REFERENCES api_course (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,"
+    " document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS api_course_search_document_gin ON api_course_search USING gin (document)",
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_CREATE)
+    elif vendor == "postgresql":
+        for statement in POSTGRES_CREATE:
+            schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS api_course_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_coursestats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
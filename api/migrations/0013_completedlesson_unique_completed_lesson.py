@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+def remove_duplicate_completions(apps, schema_editor):
+    CompletedLesson = apps.get_model('api', 'CompletedLesson')
+    duplicates = (
+        CompletedLesson.objects.filter(user__isnull=False)
+        .values('user_id', 'variant_item_id')
+        .annotate(first_id=models.Min('id'), count=models.Count('id'))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        CompletedLesson.objects.filter(
+            user_id=row['user_id'], variant_item_id=row['variant_item_id'], id__gt=row['first_id']
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_course_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_completions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='completedlesson',
+            constraint=models.UniqueConstraint(fields=('user', 'variant_item'), name='unique_completed_lesson'),
+        ),
+    ]
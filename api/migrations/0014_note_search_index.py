@@ -0,0 +1,57 @@
+from django.db import migrations
+
+
+SQLITE_CREATE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS api_note_search USING fts5(
+    scope, title, note,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+SQLITE_POPULATE = (
+    "INSERT INTO api_note_search (rowid, scope, title, note) "
+    "SELECT id, user_id, COALESCE(title, ''), note FROM api_note"
+)
+
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS api_note_search ("
+    " note_pk bigint PRIMARY KEY REFERENCES api_note (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,"
+    " scope bigint,"
+    " document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS api_note_search_document_gin ON api_note_search USING gin (document)",
+    "CREATE INDEX IF NOT EXISTS api_note_search_scope ON api_note_search (scope)",
+]
+
+POSTGRES_POPULATE = (
+    "INSERT INTO api_note_search (note_pk, scope, document) "
+    "SELECT id, user_id, setweight(to_tsvector('simple', COALESCE(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', note), 'B') FROM api_note"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_CREATE)
+        schema_editor.execute(SQLITE_POPULATE)
+    elif vendor == "postgresql":
+        for statement in POSTGRES_CREATE:
+            schema_editor.execute(statement)
+        schema_editor.execute(POSTGRES_POPULATE)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS api_note_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_completedlesson_unique_completed_lesson'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+def remove_duplicate_wishlist_items(apps, schema_editor):
+    Wishlist = apps.get_model('api', 'Wishlist')
+    duplicates = (
+        Wishlist.objects.filter(user__isnull=False)
+        .values('user_id', 'course_id')
+        .annotate(first_id=models.Min('id'), count=models.Count('id'))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        Wishlist.objects.filter(
+            user_id=row['user_id'], course_id=row['course_id'], id__gt=row['first_id']
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_note_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_wishlist_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='wishlist',
+            constraint=models.UniqueConstraint(fields=('user', 'course'), name='unique_wishlist_course'),
+        ),
+    ]
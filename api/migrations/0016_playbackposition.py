@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api', '0015_wishlist_unique_wishlist_course'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlaybackPosition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('variant_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='api.variantitem')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='playbackposition',
+            constraint=models.UniqueConstraint(fields=('user', 'variant_item'), name='unique_playback_position'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:23
+
+from django.db import migrations, models
+
+
+def remove_duplicate_certificates(apps, schema_editor):
+    Certificate = apps.get_model('api', 'Certificate')
+    duplicates = (
+        Certificate.objects.filter(user__isnull=False)
+        .values('user_id', 'course_id')
+        .annotate(first_id=models.Min('id'), count=models.Count('id'))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        Certificate.objects.filter(
+            user_id=row['user_id'], course_id=row['course_id'], id__gt=row['first_id']
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_playbackposition'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='rendered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(remove_duplicate_certificates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='certificate',
+            constraint=models.UniqueConstraint(fields=('user', 'course'), name='unique_certificate'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_sync_tracking'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrolledcourse',
+            index=models.Index(fields=['teacher', 'user'], name='enrolled_teacher_user_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models.functions import TruncDate
+
+
+def build_revenue_rollup(apps, schema_editor):
+    CartOrderItem = apps.get_model('api', 'CartOrderItem')
+    CourseDailyRevenue = apps.get_model('api', 'CourseDailyRevenue')
+    rows = (
+        CartOrderItem.objects.filter(order__payment_status='Paid')
+        .annotate(day=TruncDate('date'))
+        .values('teacher_id', 'course_id', 'day')
+        .annotate(revenue=models.Sum('price'), sales=models.Count('id'))
+        .order_by()
+    )
+    CourseDailyRevenue.objects.bulk_create([CourseDailyRevenue(**row) for row in rows], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_enrolledcourse_teacher_user_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseDailyRevenue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('revenue', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('sales', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_revenue', to='api.course')),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_revenue', to='api.teacher')),
+            ],
+            options={
+                'verbose_name_plural': 'Course Daily Revenue',
+                'indexes': [models.Index(fields=['teacher', 'day'], name='revenue_teacher_day_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='coursedailyrevenue',
+            constraint=models.UniqueConstraint(fields=('teacher', 'course', 'day'), name='unique_course_daily_revenue'),
+        ),
+        migrations.RunPython(build_revenue_rollup, migrations.RunPython.noop),
+    ]
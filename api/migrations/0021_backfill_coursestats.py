@@ -0,0 +1,50 @@
+from django.db import migrations, models
+
+
+def backfill_course_stats(apps, schema_editor):
+    """
+    Creates the missing CourseStats rows from live aggregates (same counters as CourseStats.compute()).
+    """
+    Course = apps.get_model('api', 'Course')
+    CourseStats = apps.get_model('api', 'CourseStats')
+    Review = apps.get_model('api', 'Review')
+    EnrolledCourse = apps.get_model('api', 'EnrolledCourse')
+    VariantItem = apps.get_model('api', 'VariantItem')
+
+    course_ids = list(Course.objects.filter(stats__isnull=True).values_list('id', flat=True))
+    for start in range(0, len(course_ids), 500):
+        batch = course_ids[start:start + 500]
+        counters = {course_id: {} for course_id in batch}
+
+        star_counts = {f'rating_{star}': models.Count('id', filter=models.Q(rating=star)) for star in range(1, 6)}
+        for row in Review.objects.filter(active=True, course_id__in=batch).values('course').annotate(
+            rating_sum=models.Sum('rating'), rating_count=models.Count('id'), **star_counts
+        ):
+            counters[row['course']].update({field: row[field] or 0 for field in ('rating_sum', 'rating_count', *star_counts)})
+
+        for row in EnrolledCourse.objects.filter(course_id__in=batch).values('course').annotate(enrollment_count=models.Count('id')):
+            counters[row['course']]['enrollment_count'] = row['enrollment_count']
+
+        for row in VariantItem.objects.filter(variant__course_id__in=batch).values('variant__course').annotate(
+            lecture_count=models.Count('id'), content=models.Sum('duration')
+        ):
+            counters[row['variant__course']].update({
+                'lecture_count': row['lecture_count'],
+                'content_seconds': int(row['content'].total_seconds()) if row['content'] else 0,
+            })
+
+        CourseStats.objects.bulk_create(
+            [CourseStats(course_id=course_id, **values) for course_id, values in counters.items()],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_coursedailyrevenue'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_course_stats, migrations.RunPython.noop),
+    ]
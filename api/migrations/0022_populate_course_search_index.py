@@ -0,0 +1,62 @@
+from django.db import migrations
+
+
+# Published courses only, lecture titles concatenated in one column; later changes are indexed
+# by the signals, or by python manage.py rebuild_search_index.
+SOURCE = (
+    "FROM {course} course "
+    "LEFT JOIN {category} category ON category.id = course.category_id "
+    "LEFT JOIN {teacher} teacher ON teacher.id = course.teacher_id "
+    "WHERE course.platform_status = 'Published' AND course.teacher_status = 'Published'"
+)
+
+SQLITE_POPULATE = (
+    "INSERT INTO api_course_search (rowid, title, description, category, teacher, lectures) "
+    "SELECT course.id, COALESCE(course.title, ''), COALESCE(course.description, ''), "
+    "COALESCE(category.title, ''), COALESCE(teacher.full_name, ''), "
+    "COALESCE((SELECT group_concat(item.title, ' ') FROM {variantitem} item "
+    "JOIN {variant} variant ON variant.id = item.variant_id WHERE variant.course_id = course.id), '') "
+    + SOURCE
+)
+
+POSTGRES_POPULATE = (
+    "INSERT INTO api_course_search (course_id, document) "
+    "SELECT course.id, "
+    "setweight(to_tsvector('simple', COALESCE(course.title, '')), 'A') || "
+    "setweight(to_tsvector('simple', COALESCE(category.title, '')), 'B') || "
+    "setweight(to_tsvector('simple', COALESCE(teacher.full_name, '')), 'B') || "
+    "setweight(to_tsvector('simple', COALESCE((SELECT string_agg(item.title, ' ') FROM {variantitem} item "
+    "JOIN {variant} variant ON variant.id = item.variant_id WHERE variant.course_id = course.id), '')), 'C') || "
+    "setweight(to_tsvector('simple', COALESCE(course.description, '')), 'D') "
+    + SOURCE
+)
+
+
+def populate_course_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        statement = SQLITE_POPULATE
+    elif vendor == "postgresql":
+        statement = POSTGRES_POPULATE
+    else:
+        return
+    tables = {
+        name: apps.get_model("api", model)._meta.db_table
+        for name, model in (
+            ("course", "Course"), ("category", "Category"), ("teacher", "Teacher"),
+            ("variant", "Variant"), ("variantitem", "VariantItem"),
+        )
+    }
+    schema_editor.execute("DELETE FROM api_course_search")
+    schema_editor.execute(statement.format(**tables))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_backfill_coursestats'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_course_search_index, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,14 @@
 from moviepy.editor import VideoFileClip
 import math
+from datetime import timedelta
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Cast, Coalesce, Greatest, NullIf, TruncDate
 from django.utils.text import slugify
 from shortuuid.django_fields import ShortUUIDField
 from django.utils import timezone
 
-from userauths.models import User, Profile
+from userauths.models import User
 # Create your models here.
 
 LANGUAGES = (
@@ -101,7 +103,7 @@ class Category(models.Model):
         return self.title
 
     def course_count(self):
-        return Course.objects.filter(category=self).count()
+        return Course.objects.published().filter(category=self).count()
 
     def save(self, *args, **kwargs):
         print("Saving Category:", self.title)
@@ -111,6 +113,71 @@ class Category(models.Model):
         super(Category, self).save(*args, **kwargs)
 
 
+COURSE_CARD_FIELDS = (
+    "id",
+    "slug",
+    "title",
+    "image",
+    "price",
+    "level",
+    "language",
+    "teacher_name",
+    "category_title",
+    "category_slug",
+    "rating_average",
+    "rating_count",
+    "enrollment_count",
+    "date",
+)
+
+
+def rating_average_expression(prefix=""):
+    """
+    SQL expression for rating_sum / rating_count of a CourseStats row (NULL when there are no ratings).
+    """
+    return models.ExpressionWrapper(
+        Cast(models.F(f"{prefix}rating_sum"), models.FloatField()) / NullIf(models.F(f"{prefix}rating_count"), 0),
+        output_field=models.FloatField(),
+    )
+
+
+COURSE_DETAIL_REVIEWS = 10
+
+
+class CourseQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(platform_status="Published", teacher_status="Published")
+
+    def with_detail_data(self):
+        """
+        Loads everything the course detail serializer needs in a fixed number of queries:
+        one for the courses (with category, teacher and stats joined) and
+        one per prefetched relation. Only the latest COURSE_DETAIL_REVIEWS reviews are loaded.
+        """
+        return self.select_related("category", "teacher", "stats").prefetch_related(
+            models.Prefetch("variants", queryset=Variant.objects.prefetch_related("variant_items")),
+            models.Prefetch(
+                "review_set",
+                queryset=Review.objects.filter(active=True).select_related("user__profile").order_by("-date", "-id")[:COURSE_DETAIL_REVIEWS],
+                to_attr="latest_reviews",
+            ),
+        )
+
+    def cards(self, *extra_fields):
+        """
+        Slim projection used by the course lists (catalog, search, wishlist, teacher courses).
+        Returns plain dicts with the COURSE_CARD_FIELDS keys (plus `extra_fields`) in a single query.
+        """
+        return self.annotate(
+            teacher_name=models.F("teacher__full_name"),
+            category_title=models.F("category__title"),
+            category_slug=models.F("category__slug"),
+            rating_average=rating_average_expression("stats__"),
+            rating_count=Coalesce(models.F("stats__rating_count"), 0),
+            enrollment_count=Coalesce(models.F("stats__enrollment_count"), 0),
+        ).values(*COURSE_CARD_FIELDS, *extra_fields)
+
+
 class Course(models.Model):
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
     teacher = models.ForeignKey(Teacher, on_delete=models.SET_NULL, null=True, blank=True)
@@ -128,6 +195,14 @@ class Course(models.Model):
     slug = models.SlugField(unique=True, null=True, blank=True)
     date = models.DateTimeField(default=timezone.now)
 
+    objects = CourseQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Backs the (date, id) keyset pagination of the course listings.
+            models.Index(fields=['-date', '-id'], name='course_date_id_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -140,17 +215,26 @@ class Course(models.Model):
         return EnrolledCourse.objects.filter(course=self)
 
     def curriculum(self):
-        return Variant.objects.filter(course=self)
+        return self.variants.all()
 
     def lectures(self):
         return VariantItem.objects.filter(variant__course=self)
 
+    def course_stats(self):
+        """
+        The stored counters, or zeroed unsaved ones when the row does not exist yet.
+        Never writes: rows are created by the signals and by `rebuild_course_stats`.
+        """
+        try:
+            return self.stats
+        except CourseStats.DoesNotExist:
+            return CourseStats(course=self)
+
     def average_rating(self):
-        average_rating = Review.objects.filter(course=self).aggregate(avg_rating=models.Avg('rating'))
-        return average_rating['avg_rating']
+        return self.course_stats().average_rating()
 
     def rating_count(self):
-        return Review.objects.filter(course=self, active=True).count()
+        return self.course_stats().rating_count
 
     def reviews(self):
         return Review.objects.filter(course=self, active=True)
@@ -161,15 +245,16 @@ class Variant(models.Model):
     title = models.CharField(max_length=200)
     variant_id = ShortUUIDField(unique=True, length=6, max_length=20, alphabet='0123456789')
     date = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.title
 
     def variant_item(self):
-        return VariantItem.objects.filter(variant=self)
+        return self.variant_items.all()
 
     def items(self):
-        return VariantItem.objects.filter(variant=self)
+        return self.variant_items.all()
 
 
 class VariantItem(models.Model):
@@ -182,6 +267,7 @@ class VariantItem(models.Model):
     preview = models.BooleanField(default=False)
     variant_item_id = ShortUUIDField(unique=True, length=6, max_length=20, alphabet='0123456789')
     date = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.variant.title} - {self.title}"
@@ -200,7 +286,35 @@ class VariantItem(models.Model):
     
             duration_text = f"{minutes}m {seconds}s"
             self.content_duration = duration_text
-            super().save(update_fields=['content_duration'])
+            self.duration = timedelta(seconds=duration_seconds)
+            super().save(update_fields=['content_duration', 'duration'])
+
+
+QUESTION_THREAD_MESSAGES = 10
+
+
+class QuestionAnswerQuerySet(models.QuerySet):
+    def threads(self):
+        """
+        Loads the Q&A thread lists in a fixed number of queries: the threads (with their author's profile
+        joined and annotated with `message_count` and `last_activity`) and the first
+        QUESTION_THREAD_MESSAGES messages of every thread. Longer threads are paged separately.
+        """
+        messages = Question_Answer_Message.objects.filter(question=models.OuterRef("pk")).order_by()
+        message_count = messages.annotate(total=models.Func(models.F("id"), function="COUNT")).values("total")
+        latest_message = messages.annotate(
+            latest=models.Func(models.F("date"), function="MAX", output_field=models.DateTimeField())
+        ).values("latest")
+        return self.select_related("user__profile").annotate(
+            message_count=Coalesce(models.Subquery(message_count), 0),
+            last_activity=Coalesce(models.Subquery(latest_message), models.F("date")),
+        ).prefetch_related(
+            models.Prefetch(
+                "question_answer_message_set",
+                queryset=Question_Answer_Message.objects.select_related("user__profile").order_by("date", "id")[:QUESTION_THREAD_MESSAGES],
+                to_attr="first_messages",
+            ),
+        )
 
 
 class Question_Answer(models.Model):
@@ -209,6 +323,9 @@ class Question_Answer(models.Model):
     title = models.CharField(max_length=1000, null=True, blank=True)
     qa_id = ShortUUIDField(unique=True, length=6, max_length=20, alphabet='0123456789')
     date = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = QuestionAnswerQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.user.username} - {self.course.title}"
@@ -217,10 +334,10 @@ class Question_Answer(models.Model):
         ordering = ['-date']
 
     def messages(self):
-        return Question_Answer_Message.objects.filter(question=self)
+        return self.question_answer_message_set.all()
 
     def profile(self):
-        return Profile.objects.get(user=self.user)
+        return self.user.profile
 
 
 class Question_Answer_Message(models.Model):
@@ -231,6 +348,7 @@ class Question_Answer_Message(models.Model):
     qam_id = ShortUUIDField(unique=True, length=6, max_length=20, alphabet='0123456789')
     qa_id = ShortUUIDField(unique=True, length=6, max_length=20, alphabet='0123456789')
     date = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.user.username} - {self.course.title}"
@@ -239,7 +357,7 @@ class Question_Answer_Message(models.Model):
         ordering = ['date']
 
     def profile(self):
-        return Profile.objects.get(user=self.user)
+        return self.user.profile
 
 
 class Cart(models.Model):
@@ -315,12 +433,23 @@ class Certificate(models.Model):
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     certificate_id = ShortUUIDField(unique=True, length=6, max_length=20, alphabet='0123456789')
     date = models.DateTimeField(default=timezone.now)
+    rendered_at = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return self.course.title
 
     class Meta:
         ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'course'], name='unique_certificate'),
+        ]
+
+    def files(self):
+        """
+        URLs of the rendered certificate ({format: url}), empty until the background render is done.
+        """
+        from api.certificates import certificate_files
+        return certificate_files(self)
 
 
 class CompletedLesson(models.Model):
@@ -328,12 +457,34 @@ class CompletedLesson(models.Model):
     variant_item = models.ForeignKey(VariantItem, on_delete=models.CASCADE)
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
     date = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.course.title
 
     class Meta:
         ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'variant_item'], name='unique_completed_lesson'),
+        ]
+
+
+class PlaybackPosition(models.Model):
+    """
+    Where a student stopped watching a lecture, in seconds. Written in batches by api/playback.py.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    variant_item = models.ForeignKey(VariantItem, on_delete=models.CASCADE)
+    position = models.PositiveIntegerField(default=0)
+    date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'variant_item'], name='unique_playback_position'),
+        ]
+
+    def __str__(self):
+        return f"{self.variant_item} @ {self.position}s"
 
 
 class EnrolledCourse(models.Model):
@@ -349,24 +500,138 @@ class EnrolledCourse(models.Model):
 
     class Meta:
         ordering = ['-date']
+        indexes = [
+            # Distinct students of a teacher (teacher dashboard) from the index alone.
+            models.Index(fields=['teacher', 'user'], name='enrolled_teacher_user_idx'),
+        ]
 
     def lectures(self):
-        return VariantItem.objects.filter(variant__course=self.course)
+        return self._bulk_related("lectures", lambda: VariantItem.objects.filter(variant__course=self.course))
 
     def completed_lessons(self):
-        return CompletedLesson.objects.filter(course=self.course, user=self.user)
+        return self._bulk_related("completed_lessons", lambda: CompletedLesson.objects.filter(course=self.course, user=self.user))
 
     def curriculum(self):  # Chuong trinh giang day
-        return Variant.objects.filter(course=self.course)
+        return self._bulk_related("curriculum", lambda: Variant.objects.filter(course=self.course))
 
     def note(self):
-        return Note.objects.filter(course=self.course, user=self.user)
+        return self._bulk_related("note", lambda: Note.objects.filter(course=self.course, user=self.user))
 
     def question_answer(self):
-        return Question_Answer.objects.filter(course=self.course)
+        return self._bulk_related("question_answer", lambda: Question_Answer.objects.filter(course=self.course))
 
     def review(self):
-        return Review.objects.filter(course=self.course, user=self.user).first()
+        return self._bulk_related("review", lambda: Review.objects.filter(course=self.course, user=self.user).first())
+
+    def progress(self):
+        return self._bulk_related("progress", lambda: EnrolledCourse.compute_progress([self])[self.id])
+
+    @staticmethod
+    def compute_progress(enrollments):
+        """
+        Lesson progress of each enrollment: {enrollment_id: {completed_lessons, total_lessons, percent, last_activity}}.
+        Completions are counted in one grouped query over CompletedLesson joined to VariantItem (so lessons that
+        moved to another course do not count); totals come from CourseStats.lecture_count.
+        """
+        enrollments = list(enrollments)
+        course_ids = {enrollment.course_id for enrollment in enrollments}
+        user_ids = {enrollment.user_id for enrollment in enrollments}
+
+        completed = {
+            (row["user_id"], row["course_id"]): row
+            for row in CompletedLesson.objects.filter(
+                user_id__in=user_ids,
+                course_id__in=course_ids,
+                variant_item__variant__course_id=models.F("course_id"),
+            ).values("user_id", "course_id").annotate(
+                completed=models.Count("variant_item", distinct=True),
+                last_activity=models.Max("date"),
+            )
+        }
+        totals = dict(CourseStats.objects.filter(course_id__in=course_ids).values_list("course_id", "lecture_count"))
+        missing = course_ids - set(totals) - {None}
+        if missing:
+            totals.update(
+                VariantItem.objects.filter(variant__course_id__in=missing)
+                .values("variant__course_id").annotate(total=models.Count("id"))
+                .values_list("variant__course_id", "total")
+            )
+
+        progress = {}
+        for enrollment in enrollments:
+            row = completed.get((enrollment.user_id, enrollment.course_id), {})
+            total = totals.get(enrollment.course_id, 0)
+            done = min(row.get("completed", 0), total)
+            progress[enrollment.id] = {
+                "completed_lessons": done,
+                "total_lessons": total,
+                "percent": round(done * 100 / total, 2) if total else 0,
+                "last_activity": row.get("last_activity"),
+            }
+        return progress
+
+    @classmethod
+    def load_progress(cls, enrollments):
+        """
+        Computes progress() for many enrollments at once and caches it on each of them.
+        """
+        enrollments = list(enrollments)
+        progress = cls.compute_progress(enrollments)
+        for enrollment in enrollments:
+            enrollment.__dict__.setdefault("_related_cache", {})["progress"] = progress[enrollment.id]
+        return enrollments
+
+    def resume_positions(self):
+        from api.playback import enrollment_resume_positions
+        return self._bulk_related("resume_positions", lambda: enrollment_resume_positions([self])[self.id])
+
+    @classmethod
+    def load_resume_positions(cls, enrollments):
+        """
+        Computes resume_positions() for many enrollments at once and caches it on each of them.
+        """
+        from api.playback import enrollment_resume_positions
+        enrollments = list(enrollments)
+        positions = enrollment_resume_positions(enrollments)
+        for enrollment in enrollments:
+            enrollment.__dict__.setdefault("_related_cache", {})["resume_positions"] = positions[enrollment.id]
+        return enrollments
+
+    def _bulk_related(self, name, fallback):
+        related = getattr(self, "_related_cache", {})
+        if name in related:
+            return related[name]
+        return fallback()
+
+    @classmethod
+    def load_related(cls, enrollments, names, since=None):
+        """
+        Loads the given relations (keys of ENROLLMENT_RELATIONS) for many enrollments with one
+        query per relation and caches them on each enrollment, so that lectures(),
+        completed_lessons(), ... do not query again.
+        With `since`, only the objects changed since then are loaded (see ENROLLMENT_CHANGES).
+        """
+        enrollments = list(enrollments)
+        course_ids = {enrollment.course_id for enrollment in enrollments}
+        user_ids = {enrollment.user_id for enrollment in enrollments}
+
+        for name in names:
+            loader, per_user, many = ENROLLMENT_RELATIONS[name]
+            objects = loader(course_ids, user_ids)
+            if since is not None:
+                objects = objects.filter(ENROLLMENT_CHANGES[name](since)).distinct()
+            grouped = {}
+            for obj in objects:
+                key = (obj.user_id, obj.course_id) if per_user else obj.course_id
+                grouped.setdefault(key, []).append(obj)
+
+            for enrollment in enrollments:
+                key = (enrollment.user_id, enrollment.course_id) if per_user else enrollment.course_id
+                objects = grouped.get(key, [])
+                if not many:
+                    objects = objects[0] if objects else None
+                enrollment.__dict__.setdefault("_related_cache", {})[name] = objects
+        return enrollments
 
 
 class Note(models.Model):
@@ -376,6 +641,7 @@ class Note(models.Model):
     note = models.TextField()
     note_id = ShortUUIDField(unique=True, length=6, max_length=20, alphabet='0123456789')
     date = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.title
@@ -389,12 +655,13 @@ class Review(models.Model):
     repy = models.CharField(max_length=1000, null=True, blank=True)
     active = models.BooleanField(default=False)
     date = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.course.title
 
     def profile(self):
-        return Profile.objects.get(user=self.user)
+        return self.user.profile
 
 
 class Notification(models.Model):
@@ -431,6 +698,11 @@ class Wishlist(models.Model):
     def __str__(self):
         return self.course.title
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'course'], name='unique_wishlist_course'),
+        ]
+
 
 class Country(models.Model):
     name = models.CharField(max_length=100)
@@ -439,3 +711,297 @@ class Country(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class SyncTombstone(models.Model):
+    """
+    Records the deletion of an object nested in an enrollment, so that delta syncs
+    (StudentDetailAPIView ?since=) can tell clients what to drop. `relation` is the
+    EnrolledCourseSerializer field the object belonged to; `user_id` is only set for
+    per-student objects (notes, completions, reviews).
+    """
+    relation = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+    course_id = models.PositiveBigIntegerField()
+    user_id = models.PositiveBigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    # Clients that last synced before this get a full response, so older tombstones can be pruned.
+    RETENTION = timedelta(days=30)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['course_id', 'deleted_at'], name='tombstone_course_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.relation} #{self.object_id}"
+
+    @classmethod
+    def prune(cls):
+        return cls.objects.filter(deleted_at__lt=timezone.now() - cls.RETENTION).delete()[0]
+
+
+# Bulk loaders used by EnrolledCourse.load_related(): name -> (loader(course_ids, user_ids), per user, many).
+# The select_related/prefetch_related calls cover what the nested serializers walk at depth 3
+# (users come with their groups and permissions).
+ENROLLMENT_RELATIONS = {
+    "lectures": (
+        lambda course_ids, user_ids: VariantItem.objects.filter(variant__course_id__in=course_ids)
+        .select_related("variant__course__category", "variant__course__teacher")
+        .annotate(course_id=models.F("variant__course_id")),
+        False, True,
+    ),
+    "completed_lessons": (
+        lambda course_ids, user_ids: CompletedLesson.objects.filter(course_id__in=course_ids, user_id__in=user_ids)
+        .select_related("user", "course__category", "course__teacher__user", "variant_item__variant__course")
+        .prefetch_related(
+            "user__groups__permissions", "user__user_permissions",
+            "course__teacher__user__groups", "course__teacher__user__user_permissions",
+        ),
+        True, True,
+    ),
+    "curriculum": (
+        lambda course_ids, user_ids: Variant.objects.filter(course_id__in=course_ids)
+        .select_related("course__category", "course__teacher__user")
+        .prefetch_related("course__teacher__user__groups", "course__teacher__user__user_permissions", models.Prefetch(
+            "variant_items", queryset=VariantItem.objects.select_related("variant__course__category", "variant__course__teacher")
+        )),
+        False, True,
+    ),
+    "note": (
+        lambda course_ids, user_ids: Note.objects.filter(course_id__in=course_ids, user_id__in=user_ids),
+        True, True,
+    ),
+    "question_answer": (
+        lambda course_ids, user_ids: Question_Answer.objects.filter(course_id__in=course_ids)
+        .select_related("user__profile")
+        .prefetch_related(models.Prefetch(
+            "question_answer_message_set", queryset=Question_Answer_Message.objects.select_related("user__profile")
+        )),
+        False, True,
+    ),
+    "review": (
+        lambda course_ids, user_ids: Review.objects.filter(course_id__in=course_ids, user_id__in=user_ids)
+        .select_related("user__profile").order_by("id"),
+        True, False,
+    ),
+}
+
+# What counts as a change of each relation for delta syncs: the object itself, or a nested object
+# that is serialized with it (the lectures of a curriculum section, the messages of a question).
+ENROLLMENT_CHANGES = {
+    "lectures": lambda since: models.Q(updated_at__gte=since),
+    "completed_lessons": lambda since: models.Q(updated_at__gte=since),
+    "curriculum": lambda since: models.Q(updated_at__gte=since) | models.Q(variant_items__updated_at__gte=since),
+    "note": lambda since: models.Q(updated_at__gte=since),
+    "question_answer": lambda since: models.Q(updated_at__gte=since) | models.Q(question_answer_message__updated_at__gte=since),
+    "review": lambda since: models.Q(updated_at__gte=since),
+}
+
+# Relation of each model in EnrolledCourseSerializer, and whether its objects belong to one student.
+SYNC_TRACKED_MODELS = {
+    VariantItem: ("lectures", False),
+    CompletedLesson: ("completed_lessons", True),
+    Variant: ("curriculum", False),
+    Note: ("note", True),
+    Question_Answer: ("question_answer", False),
+    Review: ("review", True),
+}
+
+
+class CourseStats(models.Model):
+    """
+    Denormalized counters for a course, kept up to date by the signals in api/signals.py
+    and rebuilt in bulk with `python manage.py rebuild_course_stats`.
+    Only active reviews are counted.
+    """
+    course = models.OneToOneField(Course, on_delete=models.CASCADE, related_name='stats')
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+    enrollment_count = models.PositiveIntegerField(default=0)
+    lecture_count = models.PositiveIntegerField(default=0)
+    content_seconds = models.PositiveIntegerField(default=0)
+    date = models.DateTimeField(auto_now=True)
+
+    COUNTER_FIELDS = (
+        'rating_sum', 'rating_count',
+        'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5',
+        'enrollment_count', 'lecture_count', 'content_seconds',
+    )
+
+    class Meta:
+        verbose_name_plural = "Course Stats"
+
+    def __str__(self):
+        return f"{self.course.title} stats"
+
+    def average_rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    def rating_histogram(self):
+        return {star: getattr(self, f"rating_{star}") for star, _ in RATING}
+
+    @classmethod
+    def increment(cls, course_id, rebuild_missing=True, **deltas):
+        """
+        Applies counter deltas with a single UPDATE ... SET field = MAX(field + delta, 0).
+        When the row does not exist yet it is rebuilt from live aggregates instead.
+        """
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if course_id is None or not deltas:
+            return
+        updated = cls.objects.filter(course_id=course_id).update(
+            **{field: Greatest(models.F(field) + delta, 0) for field, delta in deltas.items()},
+            date=timezone.now(),
+        )
+        if not updated and rebuild_missing:
+            cls.rebuild(course_ids=[course_id])
+
+    @classmethod
+    def compute(cls, course_ids=None):
+        """
+        Computes the counters from live aggregates, one grouped query per source table.
+        Returns {course_id: {field: value}} for every existing course (or only `course_ids`).
+        """
+        courses = Course.objects.all()
+        reviews = Review.objects.filter(active=True)
+        enrollments = EnrolledCourse.objects.all()
+        lectures = VariantItem.objects.all()
+        if course_ids is not None:
+            courses = courses.filter(id__in=course_ids)
+            reviews = reviews.filter(course_id__in=course_ids)
+            enrollments = enrollments.filter(course_id__in=course_ids)
+            lectures = lectures.filter(variant__course_id__in=course_ids)
+
+        result = {course_id: dict.fromkeys(cls.COUNTER_FIELDS, 0) for course_id in courses.values_list('id', flat=True)}
+
+        star_counts = {
+            f"rating_{star}": models.Count('id', filter=models.Q(rating=star)) for star, _ in RATING
+        }
+        for row in reviews.values('course').annotate(
+            rating_sum=models.Sum('rating'), rating_count=models.Count('id'), **star_counts
+        ):
+            if row['course'] in result:
+                result[row['course']].update({field: row[field] or 0 for field in ('rating_sum', 'rating_count', *star_counts)})
+
+        for row in enrollments.values('course').annotate(enrollment_count=models.Count('id')):
+            if row['course'] in result:
+                result[row['course']]['enrollment_count'] = row['enrollment_count']
+
+        for row in lectures.values('variant__course').annotate(
+            lecture_count=models.Count('id'), content=models.Sum('duration')
+        ):
+            if row['variant__course'] in result:
+                result[row['variant__course']]['lecture_count'] = row['lecture_count']
+                result[row['variant__course']]['content_seconds'] = int(row['content'].total_seconds()) if row['content'] else 0
+
+        return result
+
+    @classmethod
+    def rebuild(cls, course_ids=None, batch_size=500):
+        """
+        Overwrites the stored counters with live aggregates using bulk_create/bulk_update.
+        Returns the rebuilt rows.
+        """
+        computed = cls.compute(course_ids)
+        existing = {stats.course_id: stats for stats in cls.objects.filter(course_id__in=list(computed))}
+
+        to_create = []
+        to_update = []
+        for course_id, values in computed.items():
+            stats = existing.get(course_id)
+            if stats is None:
+                to_create.append(cls(course_id=course_id, **values))
+                continue
+            for field, value in values.items():
+                setattr(stats, field, value)
+            to_update.append(stats)
+
+        cls.objects.bulk_create(to_create, batch_size=batch_size, ignore_conflicts=True)
+        cls.objects.bulk_update(to_update, cls.COUNTER_FIELDS, batch_size=batch_size)
+        return to_create + to_update
+
+
+class CourseDailyRevenue(models.Model):
+    """
+    Paid sales of a course per day (in the current time zone), the source of the teacher earnings endpoints.
+    PaymentSuccessAPIView refreshes the days of the paid order items; rebuild the whole table with
+    `python manage.py rebuild_revenue_rollup`.
+    """
+    teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, related_name='daily_revenue')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='daily_revenue')
+    day = models.DateField()
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    sales = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Course Daily Revenue"
+        constraints = [
+            models.UniqueConstraint(fields=['teacher', 'course', 'day'], name='unique_course_daily_revenue'),
+        ]
+        indexes = [
+            models.Index(fields=['teacher', 'day'], name='revenue_teacher_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.course.title} - {self.day}"
+
+    @classmethod
+    def compute(cls, order_items):
+        """
+        Aggregates the paid order items of `order_items` into rollup rows, one grouped query.
+        """
+        rows = order_items.filter(order__payment_status="Paid").annotate(day=TruncDate("date")).values(
+            "teacher_id", "course_id", "day"
+        ).annotate(revenue=models.Sum("price"), sales=models.Count("id")).order_by()
+        return [cls(**row) for row in rows]
+
+    @classmethod
+    def refresh(cls, order_items):
+        """
+        Recomputes the (teacher, course, day) rows touched by `order_items` from the order items
+        of those days and upserts them. Idempotent, so a repeated payment callback cannot double count.
+        """
+        keys = {(item.teacher_id, item.course_id, timezone.localdate(item.date)) for item in order_items}
+        if not keys:
+            return []
+        sources = CartOrderItem.objects.filter(
+            course_id__in={course_id for _, course_id, _ in keys},
+            date__date__in={day for _, _, day in keys},
+        )
+        rows = [row for row in cls.compute(sources) if (row.teacher_id, row.course_id, row.day) in keys]
+        cls.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['teacher', 'course', 'day'],
+            update_fields=['revenue', 'sales'],
+        )
+        # Days left without a paid item (e.g. a refunded order) drop out of the rollup.
+        for teacher_id, course_id, day in keys - {(row.teacher_id, row.course_id, row.day) for row in rows}:
+            cls.objects.filter(teacher_id=teacher_id, course_id=course_id, day=day).delete()
+        return rows
+
+    @classmethod
+    def rebuild(cls, teacher_ids=None, batch_size=500):
+        """
+        Replaces the rollup (or the rows of `teacher_ids`) with aggregates of the paid order items.
+        Returns the number of rows written.
+        """
+        order_items = CartOrderItem.objects.all()
+        existing = cls.objects.all()
+        if teacher_ids is not None:
+            order_items = order_items.filter(teacher_id__in=teacher_ids)
+            existing = existing.filter(teacher_id__in=teacher_ids)
+        rows = cls.compute(order_items)
+        with transaction.atomic():
+            existing.delete()
+            cls.objects.bulk_create(rows, batch_size=batch_size)
+        return len(rows)
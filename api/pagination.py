@@ -0,0 +1,193 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on a tuple of columns, e.g. (date, id).
+    Each page is fetched with `WHERE (date, id) < (last_date, last_id) ORDER BY date DESC, id DESC LIMIT n`,
+    so deep pages cost the same as the first one (unlike LIMIT/OFFSET).
+    The last column of `ordering` must be unique to keep the ordering stable.
+    """
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering = ("-date", "-id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = tuple(getattr(view, "keyset_ordering", self.ordering))
+
+        position, reverse = self.decode_cursor(request, queryset)
+        ordering = tuple(self._invert(field) for field in self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(position, ordering))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = position is not None if not reverse else has_more
+        self.first_position = self._position(results[0]) if results else None
+        self.last_position = self._position(results[-1]) if results else None
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.last_position, False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first_position is None:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.first_position, True))
+
+    def encode_cursor(self, position, reverse):
+        payload = {"p": [self._dump(value) for value in position], "r": int(reverse)}
+        data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            payload = json.loads(data.decode("utf-8"))
+            values = payload["p"]
+            reverse = bool(payload.get("r"))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = [self._load(queryset, field.lstrip("-"), value) for field, value in zip(self.ordering, values)]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _after(self, position, ordering):
+        # (a, b) > (x, y)  ==  a > x OR (a = x AND b > y), with the direction of each column applied.
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _position(self, item):
+        names = [field.lstrip("-") for field in self.ordering]
+        if isinstance(item, dict):
+            return [item[name] for name in names]
+        return [getattr(item, name) for name in names]
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _dump(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    @staticmethod
+    def _load(queryset, name, value):
+        try:
+            field = queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # An annotation, e.g. a relevance score or a last-activity timestamp.
+            annotation = queryset.query.annotations.get(name)
+            if annotation is None:
+                return value
+            field = annotation.output_field
+        return field.to_python(value)
+
+
+class CourseCursorPagination(KeysetPagination):
+    """
+    Newest courses first, keyed on (date, id).
+    """
+    page_size = 20
+    ordering = ("-date", "-id")
+
+
+class ReviewCursorPagination(KeysetPagination):
+    page_size = 10
+    ordering = ("-date", "-id")
+
+
+class EnrollmentCursorPagination(KeysetPagination):
+    page_size = 50
+    max_page_size = 500
+    ordering = ("-date", "-id")
+
+
+class NoteCursorPagination(KeysetPagination):
+    page_size = 20
+    ordering = ("-date", "-id")
+
+
+class QuestionCursorPagination(KeysetPagination):
+    """
+    Q&A threads with the most recent activity first (expects a `last_activity` annotation).
+    """
+    page_size = 20
+    ordering = ("-last_activity", "-id")
+
+
+class MessageCursorPagination(KeysetPagination):
+    """
+    Messages of a thread in conversation order, oldest first.
+    """
+    page_size = 50
+    ordering = ("date", "id")
+
+
+class StudentRosterCursorPagination(KeysetPagination):
+    """
+    Teacher roster, most recently active students first (expects a `last_active` annotation).
+    """
+    page_size = 20
+    ordering = ("-last_active", "-id")
@@ -0,0 +1,158 @@
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.connection import ConnectionProxy
+
+from api import models as api_models
+from userauths.models import User
+
+# Playback heartbeats are buffered in the cache and written to PlaybackPosition in batches.
+#
+# Every heartbeat overwrites the latest position of (user, lecture) in the cache. The first heartbeat
+# of a pair since the last flush also appends the pair to a queue (an incrementing slot counter plus
+# one key per slot), so a student watching for minutes costs one queue entry, not one per heartbeat.
+# flush() drains the queue and upserts the latest position of every queued pair in one statement.
+#
+# The buffer lives in its own "playback" cache alias (see CACHES in backend/settings.py), which must be
+# Redis whenever more than one process serves heartbeats or flush_playback_positions runs from cron:
+# a LocMem buffer is only seen, and flushed, by the process that filled it. Slot numbers come from
+# cache.incr(), which is atomic on Redis.
+
+PLAYBACK_CACHE_ALIAS = "playback"
+PLAYBACK_FLUSH_INTERVAL = 30
+PLAYBACK_POSITION_TIMEOUT = 60 * 60 * 24
+PLAYBACK_PENDING_TIMEOUT = 60 * 10
+PLAYBACK_FLUSH_BATCH = 1000
+
+QUEUE_KEY = "api:playback:queue"
+CURSOR_KEY = "api:playback:cursor"
+LOCK_KEY = "api:playback:lock"
+FLUSH_DUE_KEY = "api:playback:flush-due"
+
+cache = ConnectionProxy(caches, PLAYBACK_CACHE_ALIAS)
+
+
+def position_key(user_id, variant_item_id):
+    return f"api:playback:position:{user_id}:{variant_item_id}"
+
+
+def pending_key(user_id, variant_item_id):
+    return f"api:playback:pending:{user_id}:{variant_item_id}"
+
+
+def slot_key(slot):
+    return f"api:playback:slot:{slot}"
+
+
+def record_heartbeat(user_id, variant_item_id, position):
+    """
+    Buffers the playback position (seconds) of a lecture, identified by its public variant_item_id.
+    """
+    cache.set(position_key(user_id, variant_item_id), (int(position), timezone.now()), PLAYBACK_POSITION_TIMEOUT)
+    if cache.add(pending_key(user_id, variant_item_id), 1, PLAYBACK_PENDING_TIMEOUT):
+        try:
+            slot = cache.incr(QUEUE_KEY)
+        except ValueError:
+            cache.add(QUEUE_KEY, 0, timeout=None)
+            slot = cache.incr(QUEUE_KEY)
+        cache.set(slot_key(slot), (user_id, variant_item_id), PLAYBACK_POSITION_TIMEOUT)
+
+
+def flush_due():
+    """
+    True at most once per PLAYBACK_FLUSH_INTERVAL, so request handlers can flush without a scheduler.
+    """
+    return cache.add(FLUSH_DUE_KEY, 1, PLAYBACK_FLUSH_INTERVAL)
+
+
+def flush():
+    """
+    Writes the buffered positions to the database with batched upserts. Returns the number of rows written.
+    """
+    if not cache.add(LOCK_KEY, 1, 60):
+        return 0
+    try:
+        written = 0
+        end = cache.get(QUEUE_KEY, 0)
+        start = cache.get(CURSOR_KEY, 0)
+        if start > end:
+            # The queue counter was evicted and restarted from 0: start over, or every new slot is skipped.
+            start = 0
+            cache.set(CURSOR_KEY, 0, timeout=None)
+        while start < end:
+            stop = min(start + PLAYBACK_FLUSH_BATCH, end)
+            slots = [slot_key(slot) for slot in range(start + 1, stop + 1)]
+            pairs = set(cache.get_many(slots).values())
+            written += write_positions(pairs)
+            cache.set(CURSOR_KEY, stop, timeout=None)
+            cache.delete_many(slots)
+            start = stop
+        return written
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+def write_positions(pairs):
+    # Clear the pending markers first: a heartbeat arriving from now on queues its pair again,
+    # so its position is written by this flush or the next one.
+    cache.delete_many([pending_key(user_id, variant_item_id) for user_id, variant_item_id in pairs])
+    positions = cache.get_many([position_key(user_id, variant_item_id) for user_id, variant_item_id in pairs])
+
+    items = dict(api_models.VariantItem.objects.filter(
+        variant_item_id__in={variant_item_id for _, variant_item_id in pairs}
+    ).values_list("variant_item_id", "id"))
+    users = set(User.objects.filter(id__in={user_id for user_id, _ in pairs}).values_list("id", flat=True))
+
+    rows = []
+    for user_id, variant_item_id in pairs:
+        value = positions.get(position_key(user_id, variant_item_id))
+        if value is None or variant_item_id not in items or int(user_id) not in users:
+            continue
+        position, date = value
+        rows.append(api_models.PlaybackPosition(user_id=user_id, variant_item_id=items[variant_item_id], position=position, date=date))
+
+    api_models.PlaybackPosition.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["user", "variant_item"],
+        update_fields=["position", "date"],
+    )
+    return len(rows)
+
+
+def enrollment_resume_positions(enrollments):
+    """
+    {enrollment_id: {variant_item_id: seconds}} over the lectures of each enrollment's course,
+    the buffered positions taking precedence over the stored ones.
+    """
+    enrollments = list(enrollments)
+    course_ids = {enrollment.course_id for enrollment in enrollments}
+    user_ids = {enrollment.user_id for enrollment in enrollments}
+
+    lectures = {}
+    for course_id, variant_item_id in api_models.VariantItem.objects.filter(
+        variant__course_id__in=course_ids
+    ).values_list("variant__course_id", "variant_item_id"):
+        lectures.setdefault(course_id, []).append(variant_item_id)
+
+    stored = {
+        (user_id, variant_item_id): position
+        for user_id, variant_item_id, position in api_models.PlaybackPosition.objects.filter(
+            user_id__in=user_ids, variant_item__variant__course_id__in=course_ids
+        ).values_list("user_id", "variant_item__variant_item_id", "position")
+    }
+    buffered = cache.get_many([
+        position_key(enrollment.user_id, variant_item_id)
+        for enrollment in enrollments
+        for variant_item_id in lectures.get(enrollment.course_id, [])
+    ])
+
+    result = {}
+    for enrollment in enrollments:
+        positions = result[enrollment.id] = {}
+        for variant_item_id in lectures.get(enrollment.course_id, []):
+            value = buffered.get(position_key(enrollment.user_id, variant_item_id))
+            if value is not None:
+                positions[variant_item_id] = value[0]
+            elif (enrollment.user_id, variant_item_id) in stored:
+                positions[variant_item_id] = stored[(enrollment.user_id, variant_item_id)]
+    return result
@@ -0,0 +1,344 @@
+import re
+
+from django.conf import settings
+from django.db import connection, models
+from django.utils.module_loading import import_string
+
+from api import models as api_models
+
+
+# Weights of the indexed columns, in the order of COURSE_SEARCH_COLUMNS.
+COURSE_SEARCH_COLUMNS = ("title", "description", "category", "teacher", "lectures")
+COURSE_SEARCH_WEIGHTS = (10.0, 1.0, 4.0, 4.0, 2.0)
+NOTE_SEARCH_COLUMNS = ("title", "note")
+NOTE_SEARCH_WEIGHTS = (4.0, 1.0)
+SEARCH_RESULT_LIMIT = 500
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(query):
+    return TOKEN_RE.findall((query or "").lower())
+
+
+def course_documents(course_ids):
+    """
+    Builds the searchable text of each published course: {course_id: {column: text}}.
+    Lecture titles are concatenated into a single column.
+    """
+    documents = {}
+    courses = api_models.Course.objects.published().filter(id__in=course_ids).values(
+        "id", "title", "description", "category__title", "teacher__full_name"
+    )
+    for course in courses:
+        documents[course["id"]] = {
+            "title": course["title"] or "",
+            "description": course["description"] or "",
+            "category": course["category__title"] or "",
+            "teacher": course["teacher__full_name"] or "",
+            "lectures": [],
+        }
+
+    lectures = api_models.VariantItem.objects.filter(variant__course_id__in=course_ids).values_list("variant__course_id", "title")
+    for course_id, title in lectures:
+        if course_id in documents and title:
+            documents[course_id]["lectures"].append(title)
+
+    for document in documents.values():
+        document["lectures"] = " ".join(document["lectures"])
+    return documents
+
+
+def note_documents(note_ids):
+    """
+    Builds the searchable text of each note: {note_id: {"scope": user_id, column: text}}.
+    """
+    notes = api_models.Note.objects.filter(id__in=note_ids).values("id", "user_id", "title", "note")
+    return {
+        note["id"]: {"scope": note["user_id"], "title": note["title"] or "", "note": note["note"] or ""}
+        for note in notes
+    }
+
+
+class CourseIndex:
+    """
+    What the course index contains; mixed into the engine classes below.
+    Only published courses are indexed, so the result limit applies to published matches only.
+    """
+    model = api_models.Course
+    columns = COURSE_SEARCH_COLUMNS
+    weights = COURSE_SEARCH_WEIGHTS
+    scoped = False
+    key_column = "course_id"
+    labels = {"title": "A", "category": "B", "teacher": "B", "lectures": "C", "description": "D"}
+    lookups = {
+        "title": "title__icontains",
+        "description": "description__icontains",
+        "category": "category__title__icontains",
+        "teacher": "teacher__full_name__icontains",
+        "lectures": "variants__variant_items__title__icontains",
+    }
+
+    def get_queryset(self):
+        return api_models.Course.objects.published()
+
+    def documents(self, ids):
+        return course_documents(ids)
+
+
+class NoteIndex:
+    """
+    Student notes. Every note is scoped to its owner and searches are always restricted to one user.
+    """
+    model = api_models.Note
+    columns = NOTE_SEARCH_COLUMNS
+    weights = NOTE_SEARCH_WEIGHTS
+    scoped = True
+    scope_lookup = "user_id"
+    key_column = "note_pk"
+    labels = {"title": "A", "note": "B"}
+    lookups = {
+        "title": "title__icontains",
+        "note": "note__icontains",
+    }
+
+    def documents(self, ids):
+        return note_documents(ids)
+
+
+class BaseSearchBackend:
+    """
+    A search backend keeps an index of documents and returns ranked object ids.
+    Subclasses combine an index description (CourseIndex, NoteIndex) with a database engine.
+    """
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT, scope=None):
+        """
+        Returns a list of (id, score) pairs, best match first. Scoped indexes only return
+        documents of the given `scope`.
+        """
+        raise NotImplementedError
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def index(self, ids):
+        raise NotImplementedError
+
+    def remove(self, ids):
+        raise NotImplementedError
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+    def rebuild(self, batch_size=500):
+        self.clear()
+        ids = list(self.get_queryset().values_list("id", flat=True))
+        for start in range(0, len(ids), batch_size):
+            self.index(ids[start:start + batch_size])
+        return len(ids)
+
+    def indexed_columns(self):
+        return (("scope",) if self.scoped else ()) + tuple(self.columns)
+
+
+class SQLiteBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 index ranked with bm25(). Every search term is matched as a prefix.
+    The scope of a scoped index is an extra column that the MATCH expression filters on.
+    """
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT, scope=None):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        match = " ".join(f'"{token}"*' for token in tokens)
+        weights = ", ".join(str(weight) for weight in ((0.0,) if self.scoped else ()) + tuple(self.weights))
+        if self.scoped:
+            match = f'scope : "{int(scope)}" AND {{{" ".join(self.columns)}}} : ({match})'
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, bm25({self.table}, {weights}) AS score FROM {self.table} "
+                f"WHERE {self.table} MATCH %s ORDER BY score LIMIT %s",
+                [match, limit],
+            )
+            # bm25() is lower-is-better; flip it so that every backend returns higher-is-better scores.
+            return [(object_id, -score) for object_id, score in cursor.fetchall()]
+
+    def index(self, ids):
+        ids = list(ids)
+        if not ids:
+            return
+        documents = self.documents(ids)
+        columns = self.indexed_columns()
+        placeholders = ", ".join(["%s"] * (len(columns) + 1))
+        with connection.cursor() as cursor:
+            self._delete(cursor, ids)
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, {', '.join(columns)}) VALUES ({placeholders})",
+                [[object_id] + [document[column] for column in columns] for object_id, document in documents.items()],
+            )
+
+    def remove(self, ids):
+        ids = list(ids)
+        if ids:
+            with connection.cursor() as cursor:
+                self._delete(cursor, ids)
+
+    def _delete(self, cursor, ids):
+        placeholders = ", ".join(["%s"] * len(ids))
+        cursor.execute(f"DELETE FROM {self.table} WHERE rowid IN ({placeholders})", ids)
+
+
+class PostgresBackend(BaseSearchBackend):
+    """
+    PostgreSQL tsvector index (GIN) ranked with ts_rank_cd(). Every search term is matched as a prefix.
+    Column weights map to the A-D tsvector labels of the index; the scope is a plain indexed column.
+    """
+    config = "simple"
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT, scope=None):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        tsquery = " & ".join(f"{token}:*" for token in tokens)
+        condition, params = ("AND scope = %s", [scope]) if self.scoped else ("", [])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {self.key_column}, ts_rank_cd(document, query, 32) AS score "
+                f"FROM {self.table}, to_tsquery(%s, %s) query "
+                f"WHERE document @@ query {condition} ORDER BY score DESC LIMIT %s",
+                [self.config, tsquery, *params, limit],
+            )
+            return cursor.fetchall()
+
+    def index(self, ids):
+        ids = list(ids)
+        if not ids:
+            return
+        documents = self.documents(ids)
+        vector = " || ".join(
+            f"setweight(to_tsvector('{self.config}', %s), '{self.labels[column]}')" for column in self.columns
+        )
+        scope_column, scope_value, scope_update = ("scope, ", "%s, ", "scope = EXCLUDED.scope, ") if self.scoped else ("", "", "")
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.table} ({self.key_column}, {scope_column}document) VALUES (%s, {scope_value}{vector}) "
+                f"ON CONFLICT ({self.key_column}) DO UPDATE SET {scope_update}document = EXCLUDED.document",
+                [
+                    [object_id] + [document[column] for column in self.indexed_columns()]
+                    for object_id, document in documents.items()
+                ],
+            )
+            self._delete(cursor, [object_id for object_id in ids if object_id not in documents])
+
+    def remove(self, ids):
+        with connection.cursor() as cursor:
+            self._delete(cursor, list(ids))
+
+    def _delete(self, cursor, ids):
+        if ids:
+            cursor.execute(f"DELETE FROM {self.table} WHERE {self.key_column} = ANY(%s)", [ids])
+
+
+class DatabaseBackend(BaseSearchBackend):
+    """
+    Fallback for databases without a full-text engine: weighted icontains matching, no index.
+    """
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT, scope=None):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        score = models.Value(0.0)
+        condition = models.Q(**{self.scope_lookup: scope}) if self.scoped else models.Q()
+        for token in tokens:
+            token_condition = models.Q()
+            for column, weight in zip(self.columns, self.weights):
+                match = models.Q(**{self.lookups[column]: token})
+                token_condition |= match
+                score = score + models.Case(models.When(match, then=models.Value(weight)), default=models.Value(0.0))
+            condition &= token_condition
+        objects = (
+            self.get_queryset().filter(condition)
+            .annotate(score=models.ExpressionWrapper(score, output_field=models.FloatField()))
+            .values("id")
+            .annotate(score=models.Max("score"))
+            .order_by("-score", "id")[:limit]
+        )
+        return [(obj["id"], obj["score"]) for obj in objects]
+
+    def index(self, ids):
+        pass
+
+    def remove(self, ids):
+        pass
+
+    def clear(self):
+        pass
+
+    def rebuild(self, batch_size=500):
+        return 0
+
+
+class SQLiteSearchBackend(CourseIndex, SQLiteBackend):
+    """
+    The virtual table is created by migration 0012_course_search_index.
+    """
+    table = "api_course_search"
+
+
+class PostgresSearchBackend(CourseIndex, PostgresBackend):
+    table = "api_course_search"
+
+
+class DatabaseSearchBackend(CourseIndex, DatabaseBackend):
+    pass
+
+
+class SQLiteNoteSearchBackend(NoteIndex, SQLiteBackend):
+    """
+    The virtual table is created by migration 0014_note_search_index.
+    """
+    table = "api_note_search"
+
+
+class PostgresNoteSearchBackend(NoteIndex, PostgresBackend):
+    table = "api_note_search"
+
+
+class DatabaseNoteSearchBackend(NoteIndex, DatabaseBackend):
+    pass
+
+
+BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+NOTE_BACKENDS = {
+    "sqlite": SQLiteNoteSearchBackend,
+    "postgresql": PostgresNoteSearchBackend,
+}
+
+
+def get_search_backend():
+    """
+    Returns the backend named by settings.COURSE_SEARCH_BACKEND (a dotted path),
+    or the one matching the database vendor.
+    """
+    path = getattr(settings, "COURSE_SEARCH_BACKEND", None)
+    if path:
+        return import_string(path)()
+    return BACKENDS.get(connection.vendor, DatabaseSearchBackend)()
+
+
+def get_note_search_backend():
+    """
+    Same as get_search_backend() for the student notes index (settings.NOTE_SEARCH_BACKEND).
+    """
+    path = getattr(settings, "NOTE_SEARCH_BACKEND", None)
+    if path:
+        return import_string(path)()
+    return NOTE_BACKENDS.get(connection.vendor, DatabaseNoteSearchBackend)()
@@ -1,4 +1,5 @@
 from django.contrib.auth.password_validation import validate_password
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
@@ -122,6 +123,23 @@ class CompletedLessonSerializer(serializers.ModelSerializer):
     
 
 
+class LessonCompletionOperationSerializer(serializers.Serializer):
+    variant_item_id = serializers.CharField()
+    completed = serializers.BooleanField()
+    timestamp = serializers.DateTimeField(required=False)
+
+
+class LessonCompletionBatchSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField()
+    operations = LessonCompletionOperationSerializer(many=True, allow_empty=False, max_length=1000)
+
+
+class PlaybackHeartbeatSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField()
+    variant_item_id = serializers.CharField()
+    position = serializers.IntegerField(min_value=0)
+
+
 class Question_Answer_MessageSerializer(serializers.ModelSerializer):
     """
     Serializer for the Variant model.
@@ -145,6 +163,16 @@ class Question_AnswerSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class QuestionThreadSerializer(Question_AnswerSerializer):
+    """
+    Q&A thread of the paginated lists: the first messages only (see QuestionAnswerQuerySet.threads()),
+    the rest is paged through the thread messages endpoint.
+    """
+    messages = Question_Answer_MessageSerializer(source="first_messages", many=True, read_only=True)
+    message_count = serializers.IntegerField(read_only=True)
+    last_activity = serializers.DateTimeField(read_only=True)
+
+
 class NoteSerializer(serializers.ModelSerializer):
     """
     Serializer for the Variant model.
@@ -186,6 +214,19 @@ class VariantSerializer(serializers.ModelSerializer):
             self.Meta.depth = 3
     
 
+class EnrollmentProgressSerializer(serializers.Serializer):
+    completed_lessons = serializers.IntegerField()
+    total_lessons = serializers.IntegerField()
+    percent = serializers.FloatField()
+    last_activity = serializers.DateTimeField(allow_null=True)
+
+
+# Nested relations of an enrollment that are only serialized when asked for with ?expand=.
+ENROLLMENT_EXPANDABLE_FIELDS = (
+    "lectures", "completed_lessons", "curriculum", "note", "question_answer", "review", "resume_positions",
+)
+
+
 class EnrolledCourseSerializer(serializers.ModelSerializer):
     """
     Serializer for the Variant model.
@@ -196,6 +237,8 @@ class EnrolledCourseSerializer(serializers.ModelSerializer):
     note = NoteSerializer(many=True, read_only=True)
     question_answer = Question_AnswerSerializer(many=True, read_only=True)
     review = ReviewSerializer(many=False, read_only=True)
+    progress = EnrollmentProgressSerializer(read_only=True)
+    resume_positions = serializers.DictField(child=serializers.IntegerField(), read_only=True)
 
     class Meta:
         model = api_models.EnrolledCourse
@@ -209,6 +252,21 @@ class EnrolledCourseSerializer(serializers.ModelSerializer):
         else:
             self.Meta.depth = 3
 
+        # Sparse fieldsets: context["fields"] limits the output to the given fields (None = all of them),
+        # context["expand"] lists the nested relations to include (None = all of them).
+        fields = self.context.get("fields")
+        expand = self.context.get("expand")
+        if expand is None:
+            # progress and resume positions are only rendered by the views that compute them in bulk
+            # (EnrollmentFieldsMixin).
+            self.fields.pop("progress")
+            self.fields.pop("resume_positions")
+        for name in list(self.fields):
+            if fields is not None and name not in fields:
+                self.fields.pop(name)
+            elif expand is not None and name in ENROLLMENT_EXPANDABLE_FIELDS and name not in expand:
+                self.fields.pop(name)
+
 
 class CourseSerializer(serializers.ModelSerializer):
     """
@@ -256,10 +314,161 @@ class CourseSerializer(serializers.ModelSerializer):
             self.Meta.depth = 3
 
 
+class CourseDetailVariantItemSerializer(serializers.ModelSerializer):
+    """
+    Flat serializer for lectures in the course detail (related fields as IDs).
+    """
+    class Meta:
+        model = api_models.VariantItem
+        fields = '__all__'
+
+
+class CourseDetailVariantSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a curriculum section in the course detail.
+    Reads the lectures from the prefetched `variant_items` relation.
+    """
+    variant_item = CourseDetailVariantItemSerializer(source="variant_items", many=True, read_only=True)
+
+    class Meta:
+        model = api_models.Variant
+        fields = '__all__'
+
+
+class CourseDetailReviewSerializer(serializers.ModelSerializer):
+    """
+    Serializer for reviews in the course detail.
+    The profile is read from the joined `user__profile` instead of a query per review.
+    """
+    profile = ProfileSerializer(source="user.profile", many=False, read_only=True)
+
+    class Meta:
+        model = api_models.Review
+        fields = '__all__'
+
+
+class CourseDetailCategorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = api_models.Category
+        fields = ["id", "title", "image", "active", "slug"]
+
+
+class CourseDetailTeacherSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = api_models.Teacher
+        fields = '__all__'
+
+
+class CourseDetailSerializer(serializers.ModelSerializer):
+    """
+    Read-only serializer for the public course page.
+    Expects a queryset built with `Course.objects.with_detail_data()`, so every
+    nested value comes from joins or prefetches and no query runs per relation row.
+    Enrollments are only counted; `reviews` holds the latest reviews and the rest are
+    paged through CourseReviewListAPIView.
+    """
+    category = CourseDetailCategorySerializer(read_only=True)
+    teacher = CourseDetailTeacherSerializer(read_only=True)
+    curriculum = CourseDetailVariantSerializer(source="variants", many=True, read_only=True)
+    lectures = serializers.SerializerMethodField()
+    average_rating = serializers.FloatField(read_only=True)
+    rating_count = serializers.IntegerField(read_only=True)
+    rating_histogram = serializers.DictField(source="course_stats.rating_histogram", child=serializers.IntegerField(), read_only=True)
+    enrollment_count = serializers.IntegerField(source="course_stats.enrollment_count", read_only=True)
+    reviews = CourseDetailReviewSerializer(source="latest_reviews", many=True, read_only=True)
+
+    class Meta:
+        model = api_models.Course
+        fields = [
+            "id",
+            "category",
+            "teacher",
+            "file",
+            "image",
+            "title",
+            "description",
+            "price",
+            "language",
+            "level",
+            "platform_status",
+            "teacher_status",
+            "featured",
+            "course_id",
+            "slug",
+            "date",
+            "enrollment_count",
+            "curriculum",
+            "lectures",
+            "average_rating",
+            "rating_count",
+            "rating_histogram",
+            "reviews",
+        ]
+
+    def get_lectures(self, course):
+        lectures = [item for variant in course.variants.all() for item in variant.variant_items.all()]
+        return CourseDetailVariantItemSerializer(lectures, many=True, context=self.context).data
+
+
+class CourseEnrollmentSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the teacher's enrollment list of a course (student profile joined).
+    """
+    user_id = serializers.IntegerField(read_only=True)
+    full_name = serializers.CharField(source="user.profile.full_name", read_only=True)
+    image = serializers.FileField(source="user.profile.image", read_only=True)
+    country = serializers.CharField(source="user.profile.country", read_only=True)
+
+    class Meta:
+        model = api_models.EnrolledCourse
+        fields = ["id", "enrolled_id", "date", "user_id", "full_name", "image", "country", "order_item"]
+
+
+class CourseCardSerializer(serializers.Serializer):
+    """
+    Serializer for the slim course card used in lists.
+    Reads the dicts returned by `Course.objects.cards()`; no nested serializers.
+    """
+    id = serializers.IntegerField()
+    slug = serializers.CharField()
+    title = serializers.CharField()
+    image = serializers.SerializerMethodField()
+    price = serializers.DecimalField(max_digits=12, decimal_places=2)
+    level = serializers.CharField(allow_null=True)
+    language = serializers.CharField(allow_null=True)
+    teacher_name = serializers.CharField(allow_null=True)
+    category_title = serializers.CharField(allow_null=True)
+    category_slug = serializers.CharField(allow_null=True)
+    rating_average = serializers.FloatField(allow_null=True)
+    rating_count = serializers.IntegerField()
+    enrollment_count = serializers.IntegerField()
+    date = serializers.DateTimeField()
+
+    def get_image(self, course):
+        if not course["image"]:
+            return None
+        url = default_storage.url(course["image"])
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class WishlistCardSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    date = serializers.DateTimeField()
+    course = CourseCardSerializer()
+
+
+class WishlistBulkSerializer(serializers.Serializer):
+    add = serializers.ListField(child=serializers.IntegerField(), required=False, default=list, max_length=500)
+    remove = serializers.ListField(child=serializers.IntegerField(), required=False, default=list, max_length=500)
+
+
 class CategorySerializer(serializers.ModelSerializer):
     """
     Serializer for the Category model.
+    Expects the `published_course_count` annotation (see CategoryListAPIView).
     """
+    course_count = serializers.IntegerField(source="published_course_count", read_only=True)
 
     class Meta:
         model = api_models.Category
@@ -350,6 +559,8 @@ class CertificateSerializer(serializers.ModelSerializer):
     """
     Serializer for the Variant model.
     """
+    files = serializers.DictField(child=serializers.CharField(), read_only=True)
+
     class Meta:
         model = api_models.Certificate
         fields = '__all__'
@@ -400,10 +611,29 @@ class CountrySerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class StudentCourseProgressSerializer(EnrollmentProgressSerializer):
+    enrolled_id = serializers.CharField()
+    course_id = serializers.IntegerField(allow_null=True)
+
+
 class StudentSummarySerializer(serializers.Serializer):
     total_courses = serializers.IntegerField(default=0)
     completed_lessons = serializers.IntegerField(default=0)
     achieved_certificates = serializers.IntegerField(default=0)
+    progress = StudentCourseProgressSerializer(many=True, default=list)
+
+
+class TeacherStudentSerializer(serializers.ModelSerializer):
+    """
+    A student of the teacher roster, with the dates of their enrollments and activity in the teacher's courses.
+    """
+    date = serializers.DateTimeField(source="latest_enrolled", read_only=True)
+    first_enrolled = serializers.DateTimeField(read_only=True)
+    last_active = serializers.DateTimeField(read_only=True)
+
+    class Meta:
+        model = Profile
+        fields = ["user", "full_name", "image", "country", "date", "first_enrolled", "last_active"]
 
 
 class TeacherSummarySerializer(serializers.Serializer):
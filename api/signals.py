@@ -0,0 +1,372 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from api import models as api_models
+from api.autocomplete import AUTOCOMPLETE_VERSION
+from api.certificates import issue_certificates
+from api.cache import (
+    CATALOG_VERSION, CATEGORY_LIST_VERSION, bump_version, category_version, course_version, student_version, teacher_version,
+)
+from api.facets import COURSE_FACETS_VERSION
+from api.search import get_note_search_backend, get_search_backend
+
+
+# CourseStats counters
+# pre_save/pre_delete remember what a row contributed before the change,
+# post_save/post_delete apply the difference with a single UPDATE.
+
+def review_contribution(review):
+    if not review.active or review.rating is None:
+        return None, {}
+    rating = int(review.rating)
+    return review.course_id, {"rating_sum": rating, "rating_count": 1, f"rating_{rating}": 1}
+
+
+def enrollment_contribution(enrollment):
+    return enrollment.course_id, {"enrollment_count": 1}
+
+
+def variant_item_contribution(variant_item):
+    course_id = api_models.Variant.objects.filter(id=variant_item.variant_id).values_list("course_id", flat=True).first()
+    seconds = int(variant_item.duration.total_seconds()) if variant_item.duration else 0
+    return course_id, {"lecture_count": 1, "content_seconds": seconds}
+
+
+STATS_CONTRIBUTIONS = {
+    api_models.Review: review_contribution,
+    api_models.EnrolledCourse: enrollment_contribution,
+    api_models.VariantItem: variant_item_contribution,
+}
+
+
+def apply_stats_change(old, new, rebuild_missing=True):
+    old_course_id, old_values = old
+    new_course_id, new_values = new
+
+    if old_course_id == new_course_id:
+        fields = set(old_values) | set(new_values)
+        deltas = {field: new_values.get(field, 0) - old_values.get(field, 0) for field in fields}
+        api_models.CourseStats.increment(new_course_id, rebuild_missing=rebuild_missing, **deltas)
+        return
+
+    api_models.CourseStats.increment(old_course_id, rebuild_missing=rebuild_missing, **{field: -value for field, value in old_values.items()})
+    api_models.CourseStats.increment(new_course_id, rebuild_missing=rebuild_missing, **new_values)
+
+
+@receiver(pre_save)
+def pre_save_stats_snapshot_receiver(sender, instance, raw=False, **kwargs):
+    contribution = STATS_CONTRIBUTIONS.get(sender)
+    if contribution is None or raw:
+        return
+    previous = sender.objects.filter(pk=instance.pk).first() if instance.pk else None
+    instance._stats_snapshot = contribution(previous) if previous else (None, {})
+
+
+@receiver(post_save)
+def post_save_stats_receiver(sender, instance, raw=False, **kwargs):
+    contribution = STATS_CONTRIBUTIONS.get(sender)
+    if contribution is None or raw:
+        return
+    old = getattr(instance, "_stats_snapshot", (None, {}))
+    instance._stats_snapshot = contribution(instance)
+    apply_stats_change(old, instance._stats_snapshot)
+
+
+@receiver(pre_delete)
+def pre_delete_stats_snapshot_receiver(sender, instance, **kwargs):
+    contribution = STATS_CONTRIBUTIONS.get(sender)
+    if contribution is None:
+        return
+    instance._stats_snapshot = contribution(instance)
+
+
+@receiver(post_delete)
+def post_delete_stats_receiver(sender, instance, **kwargs):
+    if sender not in STATS_CONTRIBUTIONS:
+        return
+    old = getattr(instance, "_stats_snapshot", (None, {}))
+    # The course itself may be going away in the same delete, so never recreate its row here.
+    apply_stats_change(old, (None, {}), rebuild_missing=False)
+
+
+@receiver(post_save, sender=api_models.Course)
+def post_save_course_stats_receiver(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        api_models.CourseStats.objects.get_or_create(course=instance)
+
+
+# Course search index
+
+@receiver(post_save, sender=api_models.Course)
+def post_save_course_search_receiver(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_search_backend().index([instance.pk])
+
+
+@receiver(post_delete, sender=api_models.Course)
+def post_delete_course_search_receiver(sender, instance, **kwargs):
+    get_search_backend().remove([instance.pk])
+
+
+@receiver(post_save, sender=api_models.VariantItem)
+@receiver(post_delete, sender=api_models.VariantItem)
+def variant_item_search_receiver(sender, instance, raw=False, **kwargs):
+    # The course id was resolved by the stats snapshot receivers above.
+    course_id = getattr(instance, "_stats_snapshot", (None, {}))[0]
+    if course_id is not None and not raw:
+        get_search_backend().index([course_id])
+
+
+@receiver(post_save, sender=api_models.Category)
+@receiver(post_save, sender=api_models.Teacher)
+def course_owner_search_receiver(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    lookup = "category" if sender is api_models.Category else "teacher"
+    course_ids = api_models.Course.objects.filter(**{lookup: instance}).values_list("id", flat=True)
+    get_search_backend().index(course_ids)
+
+
+# Student notes search index
+
+@receiver(post_save, sender=api_models.Note)
+def post_save_note_search_receiver(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_note_search_backend().index([instance.pk])
+
+
+@receiver(post_delete, sender=api_models.Note)
+def post_delete_note_search_receiver(sender, instance, **kwargs):
+    get_note_search_backend().remove([instance.pk])
+
+
+# Course state before a save, used by the cache invalidation receivers below.
+
+COURSE_TRACKED_FIELDS = ("title", "slug", "category_id", "teacher_id", "platform_status", "teacher_status")
+
+
+def course_changes(course):
+    """
+    Returns the tracked fields whose value changed in the current save (all of them for a new course).
+    """
+    original = getattr(course, "_original", None)
+    if original is None:
+        return set(COURSE_TRACKED_FIELDS)
+    return {field for field in COURSE_TRACKED_FIELDS if original[field] != getattr(course, field)}
+
+
+@receiver(pre_save, sender=api_models.Course)
+def pre_save_course_snapshot_receiver(sender, instance, raw=False, **kwargs):
+    if raw or not instance.pk:
+        instance._original = None
+        return
+    instance._original = sender.objects.filter(pk=instance.pk).values(*COURSE_TRACKED_FIELDS).first()
+
+
+# Autocomplete index
+
+@receiver(post_save, sender=api_models.Course)
+def post_save_course_autocomplete_receiver(sender, instance, raw=False, **kwargs):
+    if not raw and course_changes(instance):
+        bump_version(AUTOCOMPLETE_VERSION)
+
+
+@receiver(post_delete, sender=api_models.Course)
+@receiver(post_save, sender=api_models.Category)
+@receiver(post_delete, sender=api_models.Category)
+@receiver(post_save, sender=api_models.Teacher)
+@receiver(post_delete, sender=api_models.Teacher)
+def autocomplete_receiver(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_version(AUTOCOMPLETE_VERSION)
+
+
+# Catalog facet counts
+
+@receiver(post_save, sender=api_models.Course)
+@receiver(post_delete, sender=api_models.Course)
+@receiver(post_save, sender=api_models.Category)
+@receiver(post_delete, sender=api_models.Category)
+@receiver(post_save, sender=api_models.Review)
+@receiver(post_delete, sender=api_models.Review)
+def course_facets_receiver(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_version(COURSE_FACETS_VERSION)
+
+
+# Category list (course counts)
+
+@receiver(post_save, sender=api_models.Course)
+def post_save_course_category_list_receiver(sender, instance, raw=False, **kwargs):
+    if not raw and course_changes(instance) & {"category_id", "platform_status", "teacher_status"}:
+        bump_version(CATEGORY_LIST_VERSION)
+
+
+@receiver(post_delete, sender=api_models.Course)
+@receiver(post_save, sender=api_models.Category)
+@receiver(post_delete, sender=api_models.Category)
+def category_list_receiver(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_version(CATEGORY_LIST_VERSION)
+
+
+# Public catalog response cache
+
+def invalidate_courses(course_ids):
+    """
+    Bumps the catalog version and the detail/category versions of the given courses.
+    """
+    course_ids = [course_id for course_id in course_ids if course_id is not None]
+    names = [CATALOG_VERSION]
+    for slug, category_slug in api_models.Course.objects.filter(id__in=course_ids).values_list("slug", "category__slug"):
+        names.append(course_version(slug))
+        if category_slug:
+            names.append(category_version(category_slug))
+    bump_version(*names)
+
+
+@receiver(post_save, sender=api_models.Course)
+def post_save_course_response_cache_receiver(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    names = [CATALOG_VERSION, course_version(instance.slug)]
+    category_ids = {instance.category_id}
+    original = getattr(instance, "_original", None)
+    if original:
+        names.append(course_version(original["slug"]))
+        category_ids.add(original["category_id"])
+    names += [
+        category_version(slug)
+        for slug in api_models.Category.objects.filter(id__in=[i for i in category_ids if i]).values_list("slug", flat=True)
+    ]
+    bump_version(*names)
+
+
+@receiver(post_delete, sender=api_models.Course)
+def post_delete_course_response_cache_receiver(sender, instance, **kwargs):
+    names = [CATALOG_VERSION, course_version(instance.slug)]
+    category_slug = api_models.Category.objects.filter(id=instance.category_id).values_list("slug", flat=True).first()
+    if category_slug:
+        names.append(category_version(category_slug))
+    bump_version(*names)
+
+
+@receiver(post_save, sender=api_models.Review)
+@receiver(post_delete, sender=api_models.Review)
+@receiver(post_save, sender=api_models.EnrolledCourse)
+@receiver(post_delete, sender=api_models.EnrolledCourse)
+@receiver(post_save, sender=api_models.Variant)
+@receiver(post_delete, sender=api_models.Variant)
+def course_content_response_cache_receiver(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_courses([instance.course_id])
+
+
+@receiver(post_save, sender=api_models.VariantItem)
+@receiver(post_delete, sender=api_models.VariantItem)
+def variant_item_response_cache_receiver(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_courses([getattr(instance, "_stats_snapshot", (None, {}))[0]])
+
+
+@receiver(post_save, sender=api_models.Category)
+@receiver(post_delete, sender=api_models.Category)
+@receiver(post_save, sender=api_models.Teacher)
+@receiver(post_delete, sender=api_models.Teacher)
+def course_owner_response_cache_receiver(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    lookup = "category" if sender is api_models.Category else "teacher"
+    invalidate_courses(api_models.Course.objects.filter(**{lookup: instance}).values_list("id", flat=True))
+    if sender is api_models.Category and instance.slug:
+        bump_version(category_version(instance.slug))
+
+
+# Student dashboard summary
+
+@receiver(post_save, sender=api_models.EnrolledCourse)
+@receiver(post_delete, sender=api_models.EnrolledCourse)
+@receiver(post_save, sender=api_models.CompletedLesson)
+@receiver(post_delete, sender=api_models.CompletedLesson)
+@receiver(post_save, sender=api_models.Certificate)
+@receiver(post_delete, sender=api_models.Certificate)
+def student_summary_receiver(sender, instance, raw=False, **kwargs):
+    if not raw and instance.user_id:
+        bump_version(student_version(instance.user_id))
+
+
+# Teacher dashboard summary
+
+@receiver(post_save, sender=api_models.EnrolledCourse)
+@receiver(post_delete, sender=api_models.EnrolledCourse)
+@receiver(post_save, sender=api_models.CartOrderItem)
+@receiver(post_delete, sender=api_models.CartOrderItem)
+def teacher_summary_receiver(sender, instance, raw=False, **kwargs):
+    if not raw and instance.teacher_id:
+        bump_version(teacher_version(instance.teacher_id))
+
+
+@receiver(post_save, sender=api_models.Course)
+@receiver(post_delete, sender=api_models.Course)
+def course_teacher_summary_receiver(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    teacher_ids = {instance.teacher_id}
+    original = getattr(instance, "_original", None)
+    if original is not None:
+        teacher_ids.add(original["teacher_id"])
+    bump_version(*[teacher_version(teacher_id) for teacher_id in teacher_ids if teacher_id])
+
+
+@receiver(post_save, sender=api_models.CartOrder)
+def post_save_order_teacher_summary_receiver(sender, instance, created, raw=False, **kwargs):
+    # Revenue only counts paid orders, so a payment status change affects every teacher of the order.
+    if raw or created:
+        return
+    teacher_ids = api_models.CartOrderItem.objects.filter(order=instance).values_list("teacher_id", flat=True).distinct()
+    bump_version(*[teacher_version(teacher_id) for teacher_id in teacher_ids])
+
+
+# Certificates
+
+@receiver(post_save, sender=api_models.CompletedLesson)
+def post_save_completed_lesson_certificate_receiver(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.user_id:
+        issue_certificates(api_models.EnrolledCourse.objects.filter(
+            user_id=instance.user_id, course_id=instance.course_id
+        ).only("id", "user_id", "course_id"))
+
+
+# Delta sync tombstones (see StudentDetailAPIView ?since=)
+
+@receiver(post_delete)
+def sync_tombstone_receiver(sender, instance, **kwargs):
+    tracked = api_models.SYNC_TRACKED_MODELS.get(sender)
+    if tracked is None:
+        return
+    relation, per_user = tracked
+    if sender is api_models.VariantItem:
+        # The course id was resolved by the stats snapshot receivers above.
+        course_id = getattr(instance, "_stats_snapshot", (None, {}))[0]
+    else:
+        course_id = instance.course_id
+    if course_id is None or (per_user and instance.user_id is None):
+        return
+    api_models.SyncTombstone.objects.create(
+        relation=relation,
+        object_id=instance.pk,
+        course_id=course_id,
+        user_id=instance.user_id if per_user else None,
+    )
+
+
+@receiver(post_delete, sender=api_models.VariantItem)
+@receiver(post_delete, sender=api_models.Question_Answer_Message)
+def sync_touch_parent_receiver(sender, instance, **kwargs):
+    # Lectures are serialized inside their curriculum section and messages inside their question,
+    # so removing one changes the parent.
+    if sender is api_models.VariantItem:
+        api_models.Variant.objects.filter(pk=instance.variant_id).update(updated_at=timezone.now())
+    else:
+        api_models.Question_Answer.objects.filter(pk=instance.question_id).update(updated_at=timezone.now())
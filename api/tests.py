@@ -1,3 +1,675 @@
-from django.test import TestCase
+import csv
+import functools
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api import exports, models as api_models, playback
+from api.search import get_search_backend
+from userauths.models import Profile, User
+
+
+def create_user(name):
+    return User.objects.create(email=f"{name}@example.com", username=name, full_name=name)
+
+
+class CatalogTestCase(APITestCase):
+    """
+    Builds published courses with lectures, reviews and enrollments of a shared set of students.
+    """
+
+    def setUp(self):
+        cache.clear()
+        playback.cache.clear()
+        teacher_user = create_user("teacher")
+        self.teacher = api_models.Teacher.objects.create(user=teacher_user, full_name="Teacher")
+        self.category = api_models.Category.objects.create(title="Programming")
+        self.students = [create_user(f"student{index}") for index in range(3)]
+        self.course_count = 0
+
+    def create_courses(self, count):
+        courses = []
+        for _ in range(count):
+            self.course_count += 1
+            course = api_models.Course.objects.create(
+                title=f"Course {self.course_count}", teacher=self.teacher, category=self.category, price=10,
+            )
+            variant = api_models.Variant.objects.create(course=course, title="Introduction")
+            # VariantItem.save() probes the uploaded video, so lectures without a file are bulk created.
+            api_models.VariantItem.objects.bulk_create([
+                api_models.VariantItem(
+                    variant=variant, title=f"Lesson {position}", duration=timedelta(minutes=5),
+                    variant_item_id=f"{self.course_count}{position}",
+                )
+                for position in range(2)
+            ])
+            api_models.CourseStats.rebuild(course_ids=[course.id])
+            for student in self.students:
+                order = api_models.CartOrder.objects.create(student=student, payment_status="Paid")
+                order_item = api_models.CartOrderItem.objects.create(order=order, course=course, teacher=self.teacher, price=10)
+                api_models.EnrolledCourse.objects.create(user=student, course=course, teacher=self.teacher, order_item=order_item)
+                api_models.Review.objects.create(user=student, course=course, review="Good", rating=4, active=True)
+            courses.append(course)
+        cache.clear()
+        return courses
+
+
+class CourseListQueryBudgetTest(CatalogTestCase):
+    """
+    The catalog list runs a fixed number of queries whatever the number of courses.
+    """
+    # The course page, the category facet labels and the facet counts.
+    QUERY_BUDGET = 3
+    url = "/api/v1/course/course-list/"
+
+    def assert_query_budget(self, expected_courses):
+        cache.clear()
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), expected_courses)
+
+    def test_query_count_does_not_grow_with_courses(self):
+        self.create_courses(4)
+        self.assert_query_budget(4)
+        self.create_courses(4)
+        self.assert_query_budget(8)
+
+    def test_cards_carry_rating_and_enrollment_counters(self):
+        self.create_courses(1)
+        card = self.client.get(self.url).data["results"][0]
+        self.assertEqual(card["rating_count"], 3)
+        self.assertEqual(card["enrollment_count"], 3)
+
+
+class CourseKeysetPaginationTest(CatalogTestCase):
+    """
+    Walking the catalog with the next/previous cursors visits every course exactly once, in order.
+    """
+    url = "/api/v1/course/course-list/"
+
+    def test_next_and_previous_cursors(self):
+        courses = self.create_courses(5)
+        expected = [course.id for course in sorted(courses, key=lambda course: (course.date, course.id), reverse=True)]
+
+        pages = []
+        response = self.client.get(self.url, {"page_size": 2})
+        while True:
+            pages.append([card["id"] for card in response.data["results"]])
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual([course_id for page in pages for course_id in page], expected)
+
+        previous = self.client.get(response.data["previous"])
+        self.assertEqual([card["id"] for card in previous.data["results"]], pages[1])
+
+    def test_invalid_cursor_is_rejected(self):
+        self.create_courses(1)
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+
+class CourseStatsCountersTest(CatalogTestCase):
+    """
+    The signals keep CourseStats equal to the live aggregates through creates, updates and deletes.
+    """
+
+    def assert_counters_match(self, course):
+        stored = api_models.CourseStats.objects.filter(course=course).values(*api_models.CourseStats.COUNTER_FIELDS).get()
+        self.assertEqual(stored, api_models.CourseStats.compute([course.id])[course.id])
+
+    def test_review_and_enrollment_deltas(self):
+        course = self.create_courses(1)[0]
+        self.assert_counters_match(course)
+
+        review = api_models.Review.objects.filter(course=course).first()
+        review.rating = 2
+        review.save()
+        self.assert_counters_match(course)
+
+        review.active = False
+        review.save()
+        self.assert_counters_match(course)
+
+        api_models.Review.objects.filter(course=course, active=True).first().delete()
+        api_models.EnrolledCourse.objects.filter(course=course).first().delete()
+        self.assert_counters_match(course)
+
+        stats = api_models.CourseStats.objects.get(course=course)
+        self.assertEqual((stats.rating_count, stats.rating_4, stats.enrollment_count), (1, 1, 2))
+
+    def test_course_stats_without_row_does_not_write(self):
+        course = self.create_courses(1)[0]
+        api_models.CourseStats.objects.filter(course=course).delete()
+        course = api_models.Course.objects.get(pk=course.pk)
+
+        with self.assertNumQueries(1):
+            self.assertIsNone(course.average_rating())
+            self.assertEqual(course.rating_count(), 0)
+        self.assertFalse(api_models.CourseStats.objects.filter(course=course).exists())
+
+
+class CourseSearchTest(CatalogTestCase):
+    """
+    Unpublished courses are dropped from the search index, so they never take a result slot.
+    """
+    url = "/api/v1/course/search/"
+
+    def test_unpublished_courses_are_not_indexed(self):
+        published, hidden = self.create_courses(2)
+        hidden.platform_status = "Draft"
+        hidden.save()
+
+        self.assertEqual([course_id for course_id, _ in get_search_backend().search("course")], [published.id])
+        response = self.client.get(self.url, {"query": "course"})
+        self.assertEqual([card["id"] for card in response.data["results"]], [published.id])
+
+        hidden.platform_status = "Published"
+        hidden.save()
+        cache.clear()
+        response = self.client.get(self.url, {"query": "course"})
+        self.assertEqual({card["id"] for card in response.data["results"]}, {published.id, hidden.id})
+
+
+class CourseFacetFilterTest(CatalogTestCase):
+    url = "/api/v1/course/course-list/"
+
+    def test_price_bounds(self):
+        self.create_courses(1)
+        self.assertEqual(len(self.client.get(self.url, {"price_min": "5", "price_max": "20"}).data["results"]), 1)
+        self.assertEqual(len(self.client.get(self.url, {"price_min": "11"}).data["results"]), 0)
+
+    def test_non_finite_or_invalid_price_bounds_are_rejected(self):
+        self.create_courses(1)
+        for name in ("price_min", "price_max"):
+            for value in ("NaN", "Infinity", "-inf", "abc"):
+                response = self.client.get(self.url, {name: value})
+                self.assertEqual(response.status_code, 400, (name, value))
+                self.assertIn(name, response.data)
+
+
+class CourseDetailTest(CatalogTestCase):
+
+    def test_unknown_or_unpublished_course_is_not_found(self):
+        course = self.create_courses(1)[0]
+        self.assertEqual(self.client.get(f"/api/v1/course/course-detail/{course.slug}/").status_code, 200)
+        self.assertEqual(self.client.get("/api/v1/course/course-detail/no-such-course/").status_code, 404)
+
+        course.teacher_status = "Draft"
+        course.save()
+        self.assertEqual(self.client.get(f"/api/v1/course/course-detail/{course.slug}/").status_code, 404)
+
+
+class StudentCourseListTest(CatalogTestCase):
+    """
+    The enrollment list keeps its full shape by default; ?fields= and ?expand= only narrow it.
+    """
+    relations = ("lectures", "completed_lessons", "curriculum", "note", "question_answer", "review")
+
+    def url(self):
+        return f"/api/v1/student/course-list/{self.students[0].id}/"
+
+    def test_default_response_includes_every_relation(self):
+        self.create_courses(2)
+        enrollment = self.client.get(self.url()).data[0]
+        for name in self.relations:
+            self.assertIn(name, enrollment)
+        self.assertEqual(len(enrollment["lectures"]), 2)
+        self.assertEqual(enrollment["review"]["rating"], 4)
+
+    def test_fields_and_expand_narrow_the_response(self):
+        self.create_courses(1)
+        enrollment = self.client.get(self.url(), {"expand": ""}).data[0]
+        self.assertFalse(set(self.relations) & set(enrollment))
+
+        enrollment = self.client.get(self.url(), {"fields": "id,enrolled_id,lectures"}).data[0]
+        self.assertEqual(set(enrollment), {"id", "enrolled_id", "lectures"})
+
+
+class PlaybackBufferTest(CatalogTestCase):
+
+    def test_flush_writes_buffered_positions(self):
+        course = self.create_courses(1)[0]
+        lecture = api_models.VariantItem.objects.filter(variant__course=course).first()
+        student = self.students[0]
+
+        playback.record_heartbeat(student.id, lecture.variant_item_id, 30)
+        playback.record_heartbeat(student.id, lecture.variant_item_id, 45)
+        self.assertEqual(playback.flush(), 1)
+        self.assertEqual(api_models.PlaybackPosition.objects.get(user=student, variant_item=lecture).position, 45)
+
+    def test_flush_recovers_from_a_restarted_queue_counter(self):
+        course = self.create_courses(1)[0]
+        lecture = api_models.VariantItem.objects.filter(variant__course=course).first()
+        # A cursor ahead of the counter, as left behind when the counter key is evicted.
+        playback.cache.set(playback.CURSOR_KEY, 50, timeout=None)
+
+        playback.record_heartbeat(self.students[0].id, lecture.variant_item_id, 12)
+        self.assertEqual(playback.flush(), 1)
+        self.assertEqual(playback.cache.get(playback.CURSOR_KEY), 1)
+
+
+class TeacherExportTest(CatalogTestCase):
+    """
+    Exports stream the owning teacher's rows as CSV or NDJSON, in chunks, and refuse everyone else.
+    """
+
+    def url(self, teacher, export="student-export"):
+        return f"/api/v1/teacher/{export}/{teacher.id}/"
+
+    def content(self, response):
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return b"".join(response.streaming_content)
+
+    def test_export_requires_authentication(self):
+        self.create_courses(1)
+        self.assertEqual(self.client.get(self.url(self.teacher)).status_code, 401)
+        self.assertEqual(self.client.get(self.url(self.teacher, "course-order-export")).status_code, 401)
+
+    def test_teachers_only_export_their_own_data(self):
+        self.create_courses(1)
+        other = api_models.Teacher.objects.create(user=create_user("other-teacher"), full_name="Other")
+
+        self.client.force_authenticate(other.user)
+        self.assertEqual(self.client.get(self.url(self.teacher)).status_code, 403)
+        self.assertEqual(self.client.get(self.url(self.teacher, "course-order-export")).status_code, 403)
+        self.assertEqual(self.client.get("/api/v1/teacher/student-export/0/").status_code, 404)
+
+        self.client.force_authenticate(self.teacher.user)
+        response = self.client.get(self.url(self.teacher))
+        self.assertEqual(response.status_code, 200)
+        lines = self.content(response).decode().splitlines()
+        self.assertEqual(len(lines), 1 + len(self.students))
+        self.assertTrue(lines[0].startswith("enrolled_id,"))
+
+    def test_csv_and_ndjson_order_exports(self):
+        course = self.create_courses(1)[0]
+        self.client.force_authenticate(self.teacher.user)
+
+        response = self.client.get(self.url(self.teacher, "course-order-export"))
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn(f'filename="orders-{self.teacher.id}.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(self.content(response).decode())))
+        self.assertEqual(len(rows), len(self.students))
+        self.assertEqual({row["course_title"] for row in rows}, {course.title})
+        self.assertEqual(rows[0]["payment_status"], "Paid")
+
+        response = self.client.get(self.url(self.teacher, "course-order-export"), {"file_format": "ndjson", "gzip": "true"})
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn(".ndjson.gz", response["Content-Disposition"])
+        records = [json.loads(line) for line in gzip.decompress(self.content(response)).decode().splitlines()]
+        self.assertEqual([record["order_item_id"] for record in records], [row["order_item_id"] for row in rows])
+        self.assertEqual(records[0]["price"], "10.00")
+
+        self.assertEqual(self.client.get(self.url(self.teacher), {"file_format": "xml"}).status_code, 400)
+
+    def test_content_is_streamed_in_chunks(self):
+        self.create_courses(2)
+        self.client.force_authenticate(self.teacher.user)
+        small_chunks = functools.partial(exports.buffered, size=64)
+
+        with mock.patch.object(exports, "buffered", small_chunks):
+            response = self.client.get(self.url(self.teacher, "course-order-export"))
+            chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(len(b"".join(chunks).decode().splitlines()), 1 + 2 * len(self.students))
+
+
+class LessonCompletionBatchTest(CatalogTestCase):
+    url = "/api/v1/student/course-completed/batch/"
+
+    def setUp(self):
+        super().setUp()
+        self.course = self.create_courses(1)[0]
+        self.student = self.students[0]
+        self.lectures = list(api_models.VariantItem.objects.filter(variant__course=self.course).order_by("id"))
+
+    def post(self, *operations):
+        return self.client.post(self.url, {"user_id": self.student.id, "operations": list(operations)}, format="json")
+
+    def completed(self):
+        return set(api_models.CompletedLesson.objects.filter(user=self.student).values_list("variant_item_id", flat=True))
+
+    def test_batch_is_idempotent(self):
+        operations = [{"variant_item_id": lecture.variant_item_id, "completed": True} for lecture in self.lectures]
+        self.assertEqual(self.post(*operations).status_code, 200)
+        self.assertEqual(self.post(*operations).status_code, 200)
+        self.assertEqual(self.completed(), {lecture.id for lecture in self.lectures})
+
+    def test_latest_operation_wins_and_stale_undo_is_ignored(self):
+        lecture = self.lectures[0]
+        now = timezone.now()
+        self.post(
+            {"variant_item_id": lecture.variant_item_id, "completed": False, "timestamp": (now - timedelta(minutes=2)).isoformat()},
+            {"variant_item_id": lecture.variant_item_id, "completed": True, "timestamp": (now - timedelta(minutes=1)).isoformat()},
+        )
+        self.assertEqual(self.completed(), {lecture.id})
+
+        # An undo recorded before the completion does not remove it; a later one does.
+        self.post({"variant_item_id": lecture.variant_item_id, "completed": False, "timestamp": (now - timedelta(minutes=5)).isoformat()})
+        self.assertEqual(self.completed(), {lecture.id})
+        self.post({"variant_item_id": lecture.variant_item_id, "completed": False, "timestamp": now.isoformat()})
+        self.assertEqual(self.completed(), set())
+
+    def test_empty_batch_and_unknown_user_are_rejected(self):
+        self.assertEqual(self.post().status_code, 400)
+        response = self.client.post(
+            self.url, {"user_id": 0, "operations": [{"variant_item_id": "1", "completed": True}]}, format="json"
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class EnrollmentDeltaSyncTest(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.course = self.create_courses(1)[0]
+        self.student = self.students[0]
+        enrollment = api_models.EnrolledCourse.objects.get(user=self.student, course=self.course)
+        self.url = f"/api/v1/student/course-detail/{self.student.id}/{enrollment.enrolled_id}/"
+
+    def test_since_returns_only_changes_and_deletions(self):
+        first = self.client.get(self.url).data
+        self.assertEqual(len(first["lectures"]), 2)
+        self.assertNotIn("deleted", first)
+
+        note = api_models.Note.objects.create(user=self.student, course=self.course, title="Recap", note="Loops")
+        review = api_models.Review.objects.get(user=self.student, course=self.course)
+        review_id = review.id
+        review.delete()
+
+        delta = self.client.get(self.url, {"since": first["sync_token"]}).data
+        self.assertEqual([item["id"] for item in delta["note"]], [note.id])
+        self.assertEqual(delta["lectures"], [])
+        self.assertEqual(delta["deleted"]["review"], [review_id])
+        self.assertEqual(delta["deleted"]["note"], [])
+
+        unchanged = self.client.get(self.url, {"since": delta["sync_token"]}).data
+        self.assertEqual(unchanged["note"], [])
+
+    def test_expired_or_invalid_tokens(self):
+        expired = (timezone.now() - api_models.SyncTombstone.RETENTION - timedelta(days=1)).isoformat()
+        response = self.client.get(self.url, {"since": expired}).data
+        self.assertTrue(response["full_sync"])
+        self.assertEqual(len(response["lectures"]), 2)
+
+        self.assertEqual(self.client.get(self.url, {"since": "yesterday"}).status_code, 400)
+
+
+class TeacherRevenueRollupTest(CatalogTestCase):
+    """
+    The daily revenue rollup matches the paid order items, and the earnings endpoints read it per period.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course, self.other_course = self.create_courses(2)
+        api_models.CourseDailyRevenue.rebuild()
+
+    def sell(self, course, when, price, payment_status="Paid"):
+        order = api_models.CartOrder.objects.create(student=self.students[0], payment_status=payment_status)
+        return api_models.CartOrderItem.objects.create(order=order, course=course, teacher=self.teacher, price=price, date=when)
+
+    def rollup(self):
+        return set(api_models.CourseDailyRevenue.objects.values_list("course_id", "day", "revenue", "sales"))
+
+    def test_refresh_matches_rebuild(self):
+        when = timezone.now() - timedelta(days=40)
+        items = [self.sell(self.course, when, 20), self.sell(self.course, when, 30)]
+        api_models.CourseDailyRevenue.refresh(items)
+        api_models.CourseDailyRevenue.refresh(items)
+
+        day = timezone.localdate(when)
+        row = api_models.CourseDailyRevenue.objects.get(course=self.course, day=day)
+        self.assertEqual((row.revenue, row.sales), (50, 2))
+
+        refreshed = self.rollup()
+        api_models.CourseDailyRevenue.rebuild()
+        self.assertEqual(self.rollup(), refreshed)
+
+        # A day without paid items left drops out of the rollup.
+        api_models.CartOrder.objects.filter(cartorderitem__in=items).update(payment_status="Processing")
+        api_models.CourseDailyRevenue.refresh(items)
+        self.assertFalse(api_models.CourseDailyRevenue.objects.filter(course=self.course, day=day).exists())
+
+    def test_unpaid_items_are_not_counted(self):
+        self.sell(self.course, timezone.now() - timedelta(days=3), 99, payment_status="Processing")
+        before = self.rollup()
+        api_models.CourseDailyRevenue.rebuild(teacher_ids=[self.teacher.id])
+        self.assertEqual(self.rollup(), before)
+
+    def earnings(self, **params):
+        return self.client.get(f"/api/v1/teacher/all-months-earning/{self.teacher.id}/", params)
+
+    def test_months_of_different_years_stay_apart(self):
+        api_models.CourseDailyRevenue.objects.all().delete()
+        items = [
+            self.sell(self.course, timezone.make_aware(datetime(2023, 3, 10, 12)), 10),
+            self.sell(self.course, timezone.make_aware(datetime(2024, 3, 10, 12)), 15),
+            self.sell(self.other_course, timezone.make_aware(datetime(2024, 3, 20, 12)), 5),
+        ]
+        api_models.CourseDailyRevenue.refresh(items)
+
+        rows = self.earnings(end="2024-12-31").data
+        self.assertEqual([(row["year"], row["month"]) for row in rows], [(2023, 3), (2024, 3)])
+        self.assertEqual([(row["total_earning"], row["sales"]) for row in rows], [(10, 1), (20, 2)])
+
+        rows = self.earnings(granularity="year", end="2024-12-31").data
+        self.assertEqual([row["total_earning"] for row in rows], [10, 20])
+
+    def test_start_and_end_restrict_the_range(self):
+        api_models.CourseDailyRevenue.objects.all().delete()
+        items = [
+            self.sell(self.course, timezone.make_aware(datetime(2024, 1, 31, 12)), 10),
+            self.sell(self.course, timezone.make_aware(datetime(2024, 2, 1, 12)), 20),
+            self.sell(self.course, timezone.make_aware(datetime(2024, 2, 29, 12)), 40),
+        ]
+        api_models.CourseDailyRevenue.refresh(items)
+
+        rows = self.earnings(granularity="day", start="2024-02-01", end="2024-02-28").data
+        self.assertEqual([(row["period"].isoformat(), row["total_earning"]) for row in rows], [("2024-02-01", 20)])
+
+    def test_invalid_earnings_parameters(self):
+        for params in ({"granularity": "hour"}, {"start": "2024-13-01"}, {"end": "yesterday"}):
+            response = self.earnings(**params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn(next(iter(params)), response.data)
+        self.assertEqual(self.client.get("/api/v1/teacher/all-months-earning/0/").status_code, 404)
+
+    def best_selling(self, **params):
+        return self.client.get(f"/api/v1/teacher/best-course-earning/{self.teacher.id}/", params)
+
+    def test_best_selling_top_k_and_ordering(self):
+        api_models.CourseDailyRevenue.refresh([self.sell(self.other_course, timezone.now(), 100)])
+
+        rows = self.best_selling().data
+        self.assertEqual([(row["course_title"], row["revenue"], row["sales"]) for row in rows], [
+            (self.other_course.title, 130, 4),
+            (self.course.title, 30, 3),
+        ])
+        self.assertEqual([row["course_title"] for row in self.best_selling(ordering="revenue", limit=1).data], [self.course.title])
+
+        tomorrow = (timezone.localdate() + timedelta(days=1)).isoformat()
+        self.assertEqual([row["revenue"] for row in self.best_selling(start=tomorrow).data], [0, 0])
+
+    def test_invalid_best_selling_parameters(self):
+        for params in ({"ordering": "title"}, {"limit": "0"}, {"limit": "ten"}, {"start": "2024-02-30"}):
+            response = self.best_selling(**params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn(next(iter(params)), response.data)
+
+
+class ResponseCacheTest(CatalogTestCase):
+    """
+    Catalog responses carry an ETag, answer a matching If-None-Match with 304 and are invalidated by model writes.
+    """
+    url = "/api/v1/course/course-list/"
+
+    def test_matching_if_none_match_is_not_modified(self):
+        self.create_courses(1)
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"stale", W/{etag}').status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_course_save_invalidates_cached_responses(self):
+        course = self.create_courses(1)[0]
+        detail_url = f"/api/v1/course/course-detail/{course.slug}/"
+        etag = self.client.get(detail_url)["ETag"]
+        self.client.get(self.url)
+
+        course.title = "Renamed course"
+        course.save()
+
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["title"], "Renamed course")
+        self.assertEqual(self.client.get(self.url).data["results"][0]["title"], "Renamed course")
+
+    def test_review_write_invalidates_cached_responses(self):
+        course = self.create_courses(1)[0]
+        reviews_url = f"/api/v1/course/course-detail/{course.slug}/reviews/"
+        self.assertEqual(len(self.client.get(reviews_url).data["results"]), 3)
+        self.assertEqual(self.client.get(self.url).data["results"][0]["rating_count"], 3)
+
+        api_models.Review.objects.create(user=create_user("reviewer"), course=course, review="Great", rating=5, active=True)
+
+        self.assertEqual(len(self.client.get(reviews_url).data["results"]), 4)
+        self.assertEqual(self.client.get(self.url).data["results"][0]["rating_count"], 4)
+
+
+class TeacherSummaryTest(CatalogTestCase):
+    """
+    The dashboard counters come from one query, are cached and are invalidated by sales and enrollments.
+    """
+
+    def url(self, teacher_id):
+        return f"/api/v1/teacher/summary/{teacher_id}/"
+
+    def test_counters_and_invalidation(self):
+        course = self.create_courses(2)[0]
+        with self.assertNumQueries(1):
+            summary = self.client.get(self.url(self.teacher.id)).data[0]
+        # Three students enrolled in both courses are counted once.
+        self.assertEqual(summary, {"total_courses": 2, "total_students": 3, "total_revenue": 60, "monthly_revenue": 60})
+        with self.assertNumQueries(0):
+            self.client.get(self.url(self.teacher.id))
+
+        # A paid sale outside the trailing 28 days only adds to the total revenue.
+        order = api_models.CartOrder.objects.create(student=self.students[0], payment_status="Paid")
+        order_item = api_models.CartOrderItem.objects.create(
+            order=order, course=course, teacher=self.teacher, price=40, date=timezone.now() - timedelta(days=40),
+        )
+        api_models.EnrolledCourse.objects.create(user=create_user("latecomer"), course=course, teacher=self.teacher, order_item=order_item)
+
+        summary = self.client.get(self.url(self.teacher.id)).data[0]
+        self.assertEqual(summary, {"total_courses": 2, "total_students": 4, "total_revenue": 100, "monthly_revenue": 60})
+
+    def test_unknown_teacher_is_not_found(self):
+        self.assertEqual(self.client.get(self.url(0)).status_code, 404)
+
+
+class QuestionThreadTest(CatalogTestCase):
+    """
+    Q&A threads are listed with their first messages prefetched, and longer threads are paged.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course = self.create_courses(1)[0]
+        start = timezone.now() - timedelta(days=1)
+        self.threads = []
+        for index, size in enumerate((15, 2, 3)):
+            student = self.students[index]
+            thread = api_models.Question_Answer.objects.create(course=self.course, user=student, title=f"Question {index}")
+            api_models.Question_Answer_Message.objects.bulk_create([
+                api_models.Question_Answer_Message(
+                    course=self.course, question=thread, user=self.students[position % len(self.students)],
+                    message=f"Message {position}", date=start + timedelta(minutes=10 * index + position),
+                )
+                for position in range(size)
+            ])
+            self.threads.append(thread)
+
+    def test_thread_list_prefetches_messages(self):
+        url = f"/api/v1/student/question-answer-list-create/{self.course.id}/"
+        # The threads (with users, profiles and counters) and their first messages.
+        with self.assertNumQueries(2):
+            results = self.client.get(url).data["results"]
+
+        # The most recently active thread comes first.
+        self.assertEqual([thread["qa_id"] for thread in results], [self.threads[i].qa_id for i in (2, 0, 1)])
+        longest = results[1]
+        self.assertEqual(longest["message_count"], 15)
+        self.assertEqual(len(longest["messages"]), api_models.QUESTION_THREAD_MESSAGES)
+        self.assertEqual(longest["messages"][0]["message"], "Message 0")
+
+    def test_messages_are_paged_in_conversation_order(self):
+        url = f"/api/v1/student/question-answer-messages/{self.threads[0].qa_id}/"
+        first = self.client.get(url, {"page_size": 10}).data
+        self.assertEqual([message["message"] for message in first["results"]], [f"Message {i}" for i in range(10)])
+
+        second = self.client.get(first["next"]).data
+        self.assertEqual([message["message"] for message in second["results"]], [f"Message {i}" for i in range(10, 15)])
+        self.assertIsNone(second["next"])
+
+
+class TeacherStudentRosterTest(CatalogTestCase):
+    """
+    The roster lists each student of the teacher once, paged, searchable and ordered by enrollment or activity.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course = self.create_courses(2)[0]
+        now = timezone.now()
+        for days, country, student in zip((10, 5, 1), ("Ghana", "Kenya", "Ghana"), self.students):
+            api_models.EnrolledCourse.objects.filter(user=student).update(date=now - timedelta(days=days))
+            Profile.objects.filter(user=student).update(country=country)
+        # The first student to enroll is the most recently active one.
+        lecture = api_models.VariantItem.objects.filter(variant__course=self.course).first()
+        api_models.CompletedLesson.objects.create(user=self.students[0], course=self.course, variant_item=lecture, date=now)
+        self.url = f"/api/v1/teacher/student-lists/{self.teacher.id}/"
+
+    def roster(self, **params):
+        return [student["user"] for student in self.client.get(self.url, params).data["results"]]
+
+    def test_students_are_paged_once_each(self):
+        first = self.client.get(self.url, {"page_size": 2}).data
+        second = self.client.get(first["next"]).data
+        self.assertEqual(len(first["results"]), 2)
+        self.assertIsNone(second["next"])
+        users = [student["user"] for student in first["results"] + second["results"]]
+        self.assertEqual(users, [self.students[i].id for i in (0, 2, 1)])
+
+        other = api_models.Teacher.objects.create(user=create_user("other-teacher"), full_name="Other")
+        self.assertEqual(self.client.get(f"/api/v1/teacher/student-lists/{other.id}/").data["results"], [])
+
+    def test_ordering(self):
+        ids = [student.id for student in self.students]
+        self.assertEqual(self.roster(ordering="first_enrolled"), ids)
+        self.assertEqual(self.roster(ordering="-first_enrolled"), ids[::-1])
+        self.assertEqual(self.roster(ordering="last_active"), [ids[i] for i in (1, 2, 0)])
+        self.assertEqual(self.client.get(self.url, {"ordering": "full_name"}).status_code, 400)
+
+    def test_search_by_name_or_country(self):
+        self.assertEqual(self.roster(search="ghana", ordering="first_enrolled"), [self.students[0].id, self.students[2].id])
+        self.assertEqual(self.roster(search="student1"), [self.students[1].id])
+        self.assertEqual(self.roster(search="nobody"), [])
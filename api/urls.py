@@ -15,9 +15,13 @@ urlpatterns = [
 
     # Core Endpoints
     path("course/category/", api_views.CategoryListAPIView.as_view()),
+    path("course/category/<category_slug>/", api_views.CategoryCourseListAPIView.as_view()),
     path("course/course-list/", api_views.CourseListAPIView.as_view()),
     path("course/course-detail/<slug>/", api_views.CourseDetailAPIView.as_view()),
+    path("course/course-detail/<slug>/reviews/", api_views.CourseReviewListAPIView.as_view()),
     path("course/search/", api_views.SearchCourseAPIView.as_view()),
+    path("course/autocomplete/", api_views.CourseAutocompleteAPIView.as_view()),
+    path("course/cache-stats/", api_views.ResponseCacheStatsAPIView.as_view()),
     path("course/cart/", api_views.CartAPIView.as_view()),
     path("course/cart-list/<cart_id>/", api_views.CartListAPIView.as_view()),
     path("course/cart-item-delete/<cart_id>/<item_id>/", api_views.CartItemDeleteAPIView.as_view()),
@@ -33,23 +37,33 @@ urlpatterns = [
     path("student/course-list/<user_id>/", api_views.StudentCourseAPIView.as_view()),
     path("student/course-detail/<user_id>/<enrollment_id>/", api_views.StudentDetailAPIView.as_view()),
     path("student/course-completed/", api_views.StudentCourseCompletedCreateAPIView.as_view()),
+    path("student/course-completed/batch/", api_views.StudentCourseCompletedBatchAPIView.as_view()),
+    path("student/playback/", api_views.StudentPlaybackHeartbeatAPIView.as_view()),
+    path("student/certificates/<user_id>/", api_views.StudentCertificateListAPIView.as_view()),
     path("student/course-note/<user_id>/<enrollment_id>/", api_views.StudentNoteCreateAPIView.as_view()),
     path("student/course-note-detail/<user_id>/<enrollment_id>/<note_id>/", api_views.StudentDetailNoteAPIView.as_view()),
+    path("student/note-search/<user_id>/", api_views.StudentNoteSearchAPIView.as_view()),
     path("student/rate-course/", api_views.StudentRateCourseCreateAPIView.as_view()),
     path("student/review-detail/<user_id>/<review_id>/", api_views.StudentRateCourseUpdateAPIView.as_view()),
     path("student/wishlist/<user_id>/", api_views.StudentWishListListAPIView.as_view()),
+    path("student/wishlist/<user_id>/membership/", api_views.StudentWishListMembershipAPIView.as_view()),
+    path("student/wishlist/<user_id>/bulk/", api_views.StudentWishListBulkAPIView.as_view()),
     path("student/question-answer-list-create/<course_id>/", api_views.QuestionAnswerListAPIView.as_view()),
     path("student/question-answer-message-create/", api_views.QuestionAnswerMssageSendAPIView.as_view()),
+    path("student/question-answer-messages/<qa_id>/", api_views.QuestionAnswerMessageListAPIView.as_view()),
 
     # Teacher API
     path("teacher/summary/<teacher_id>/", api_views.TeacherSummaryAPIView.as_view()),
     path("teacher/course-lists/<teacher_id>/", api_views.TeacherCourseAPIView.as_view()),
+    path("teacher/course-enrollments/<course_id>/", api_views.TeacherCourseEnrollmentListAPIView.as_view()),
     path("teacher/review-lists/<teacher_id>/", api_views.TeacherReviewListAPIView.as_view()),
     path("teacher/review-detail/<teacher_id>/<review_id>", api_views.TeacherReviewDetailAPIView.as_view()),
-    path("teacher/student-lists/<teacher_id>/", api_views.TeacherStudentListAPIView.as_view({'get': 'list'})),
+    path("teacher/student-lists/<teacher_id>/", api_views.TeacherStudentListAPIView.as_view()),
     path("teacher/all-months-earning/<teacher_id>/", api_views.TeacherAllMonthEarningAPIView),
     path("teacher/best-course-earning/<teacher_id>/", api_views.TeacherBestSellingCourseAPIView.as_view({'get': 'list'})),
     path("teacher/course-order-list/<teacher_id>/", api_views.TeacherCourseOrdersListAPIView.as_view()),
+    path("teacher/course-order-export/<teacher_id>/", api_views.TeacherCourseOrdersExportAPIView.as_view()),
+    path("teacher/student-export/<teacher_id>/", api_views.TeacherStudentExportAPIView.as_view()),
     path("teacher/question-answer-list/<teacher_id>/", api_views.TeacherQuestionAnswerListAPIView.as_view()),
     path("teacher/coupon-list/<teacher_id>/", api_views.TeacherCouponListCreateAPIView.as_view()),
     path("teacher/coupon-detail/<teacher_id>/<coupon_id>/", api_views.TeacherCouponDetailAPIView.as_view()),
@@ -2,25 +2,44 @@ import random
 from decimal import Decimal
 import stripe
 import requests  # get the item from the request data
-from datetime import datetime, timedelta
+from datetime import timedelta
 from distutils.util import strtobool
 
 from django.shortcuts import redirect
+from django.core.cache import cache
 from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.contrib.auth.hashers import check_password
-from django.db import models
-from django.db.models.functions import ExtractMonth
+from django.db import models, transaction
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek, TruncYear
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework import generics, status, viewsets
-from rest_framework.permissions import AllowAny
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
 
 from api import serializer as api_serializers, models as api_models
+from api import playback
+from api.autocomplete import AUTOCOMPLETE_LIMIT, suggest
+from api.certificates import issue_certificates
+from api.cache import (
+    CATEGORY_LIST_TIMEOUT, CATEGORY_LIST_VERSION, STUDENT_SUMMARY_TIMEOUT, TEACHER_SUMMARY_TIMEOUT, CachedResponseMixin,
+    bump_version, category_version, course_version, response_cache_stats, student_version, teacher_version, versioned_key,
+)
+from api.exports import EXPORT_FORMATS, ORDER_EXPORT_COLUMNS, STUDENT_EXPORT_COLUMNS, export_response
+from api.facets import course_facets, filter_courses
+from api.pagination import (
+    CourseCursorPagination, EnrollmentCursorPagination, MessageCursorPagination, NoteCursorPagination,
+    QuestionCursorPagination, ReviewCursorPagination, StudentRosterCursorPagination,
+)
+from api.search import get_note_search_backend, get_search_backend
 from userauths.models import User, Profile
 
 
@@ -139,47 +158,107 @@ class ChangePasswordAPIView(generics.CreateAPIView):
             return Response({"message": "User does not exists.", "icon": "error"})  
 
 
-class CategoryListAPIView(generics.ListAPIView):
+class CategoryListAPIView(CachedResponseMixin, generics.ListAPIView):
     """
     View to list all categories.
     ListAPIView is used to get a list of objects.
+    The published course counts come from one annotated query, and the response is cached
+    until a course changes category or publish status (see api/signals.py).
     """
     queryset = api_models.Category.objects.filter(
-        active=True)  # queryset: based on whatever model that you're trying to list
+        active=True,
+    ).annotate(
+        published_course_count=models.Count(
+            "course",
+            filter=models.Q(course__platform_status="Published", course__teacher_status="Published"),
+        ),
+    ).order_by("title")  # queryset: based on whatever model that you're trying to list
     serializer_class = api_serializers.CategorySerializer
     permission_classes = [AllowAny]
+    cache_versions = (CATEGORY_LIST_VERSION,)
+    cache_timeout = CATEGORY_LIST_TIMEOUT
 
 
-class CourseListAPIView(generics.ListAPIView):
-    queryset = api_models.Course.objects.filter(
-        platform_status="Published",
-        teacher_status="Published",
-    )
-    serializer_class = api_serializers.CourseSerializer
+class CourseListAPIView(CachedResponseMixin, generics.ListAPIView):
+    """
+    View to list all published courses as slim cards.
+    The full course tree is only served by CourseDetailAPIView.
+    Supports the facet filters of api/facets.py and returns the facet counts with each page.
+    """
+    serializer_class = api_serializers.CourseCardSerializer
     permission_classes = [AllowAny]
+    pagination_class = CourseCursorPagination
+
+    def get_queryset(self):
+        return filter_courses(api_models.Course.objects.published().cards(), self.request.GET)
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        response.data["facets"] = course_facets(request.GET)
+        return response
+
+
+class CategoryCourseListAPIView(CachedResponseMixin, generics.ListAPIView):
+    """
+    View to browse the published courses of one category, newest first.
+    """
+    serializer_class = api_serializers.CourseCardSerializer
+    permission_classes = [AllowAny]
+    pagination_class = CourseCursorPagination
+
+    def get_cache_versions(self):
+        return [category_version(self.kwargs['category_slug'])]
+
+    def get_queryset(self):
+        category_slug = self.kwargs['category_slug']
+        return api_models.Course.objects.published().filter(
+            category__slug=category_slug,
+            category__active=True,
+        ).cards()
 
 
-class CourseDetailAPIView(generics.RetrieveAPIView):
+class CourseDetailAPIView(CachedResponseMixin, generics.RetrieveAPIView):
     """
     View to retrieve a single course by its ID.
     RetrieveAPIView is used to get a single object.
     """
-    serializer_class = api_serializers.CourseSerializer
+    serializer_class = api_serializers.CourseDetailSerializer
     permission_classes = [AllowAny]
-    queryset = api_models.Course.objects.filter(
-        platform_status="Published",
-        teacher_status="Published",
-    )
+    queryset = api_models.Course.objects.published().with_detail_data()
+
+    def get_cache_versions(self):
+        return [course_version(self.kwargs['slug'])]
 
     def get_object(self):
         slug = self.kwargs.get('slug')
         try:
-            course = api_models.Course.objects.get(slug=slug, platform_status="Published", teacher_status="Published")
+            course = self.get_queryset().get(slug=slug)
         except api_models.Course.DoesNotExist:
-            return Response({"error": "Course not found"}, status=404)
+            raise NotFound("Course not found")
         return course
 
 
+class CourseReviewListAPIView(CachedResponseMixin, generics.ListAPIView):
+    """
+    Paginated active reviews of a published course, newest first.
+    """
+    serializer_class = api_serializers.CourseDetailReviewSerializer
+    permission_classes = [AllowAny]
+    pagination_class = ReviewCursorPagination
+
+    def get_cache_versions(self):
+        return [course_version(self.kwargs['slug'])]
+
+    def get_queryset(self):
+        slug = self.kwargs['slug']
+        return api_models.Review.objects.filter(
+            course__slug=slug,
+            course__platform_status="Published",
+            course__teacher_status="Published",
+            active=True,
+        ).select_related("user__profile")
+
+
 class CartAPIView(generics.CreateAPIView):
     """
     View to handle adding items to the cart.
@@ -506,6 +585,7 @@ class PaymentSuccessAPIView(generics.CreateAPIView):
                     if order.payment_status == "Processing":
                         order.payment_status = "Paid"
                         order.save()
+                        api_models.CourseDailyRevenue.refresh(order_items)
 
                         api_models.Notification.objects.create(
                             user=order.student, order=order, type="Course Enrollment Completed"
@@ -521,7 +601,7 @@ class PaymentSuccessAPIView(generics.CreateAPIView):
                                 course=order_item.course,
                                 user=order.student,
                                 teacher=order_item.teacher,
-                                ordre_item=order_item
+                                order_item=order_item
                             )
                         return Response({"messages": "Payment Successful"})
                     else:
@@ -538,6 +618,7 @@ class PaymentSuccessAPIView(generics.CreateAPIView):
                 if order.payment_status == "Processing":
                     order.payment_status = "Paid"
                     order.save()
+                    api_models.CourseDailyRevenue.refresh(order_items)
 
                     api_models.Notification.objects.create(
                         user=order.student, order=order, type="Course Enrollment Completed"
@@ -553,7 +634,7 @@ class PaymentSuccessAPIView(generics.CreateAPIView):
                             course=order_item.course,
                             user=order.student,
                             teacher=order_item.teacher,
-                            ordre_item=order_item
+                            order_item=order_item
                         )
 
                     return Response({"messages": "Payment Successful"})
@@ -563,36 +644,122 @@ class PaymentSuccessAPIView(generics.CreateAPIView):
                 return Response({"messages": "Payment Failed"})
 
 
-class SearchCourseAPIView(generics.ListAPIView):
-    serializer_class = api_serializers.CourseSerializer
+class SearchCourseAPIView(CachedResponseMixin, generics.ListAPIView):
+    """
+    Full-text search over course title, description, category, teacher and lecture titles.
+    Results are ordered by relevance (best first); an empty query lists the newest courses.
+    """
+    serializer_class = api_serializers.CourseCardSerializer
     permission_classes = [AllowAny]
+    pagination_class = CourseCursorPagination
+
+    @property
+    def keyset_ordering(self):
+        if self.request.GET.get('query', '').strip():
+            return ("-relevance", "-id")
+        return CourseCursorPagination.ordering
 
     def get_queryset(self):
-        query = self.request.GET.get('query')
-        return api_models.Course.objects.filter(
-            title__icontains=query,
-            platform_status="Published",
-            teacher_status="Published"
+        query = self.request.GET.get('query', '')
+        courses = api_models.Course.objects.published()
+        if not query.strip():
+            return courses.cards()
+
+        results = get_search_backend().search(query)
+        relevance = models.Case(
+            *[models.When(id=course_id, then=models.Value(score)) for course_id, score in results],
+            default=models.Value(0.0),
+            output_field=models.FloatField(),
         )
+        return courses.filter(id__in=[course_id for course_id, _ in results]).annotate(relevance=relevance).cards("relevance")
+
+
+class CourseAutocompleteAPIView(generics.GenericAPIView):
+    """
+    Typeahead suggestions (courses, categories, teachers) served from the in-memory prefix index.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        query = request.GET.get('query', '')
+        try:
+            limit = int(request.GET.get('limit', AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            limit = AUTOCOMPLETE_LIMIT
+
+        return Response(suggest(query, limit))
+
+
+class ResponseCacheStatsAPIView(generics.GenericAPIView):
+    """
+    Hit/miss counters of the public catalog response cache (admin only).
+    """
+    permission_classes = [IsAdminUser]
+    cached_views = (
+        CourseListAPIView, CategoryCourseListAPIView, CourseDetailAPIView, CourseReviewListAPIView, CategoryListAPIView,
+        SearchCourseAPIView,
+    )
+
+    def get(self, request, *args, **kwargs):
+        return Response(response_cache_stats([view.__name__ for view in self.cached_views]))
+
+
+def enrollment_progress(enrollments):
+    progress = api_models.EnrolledCourse.compute_progress(enrollments)
+    return [
+        {"enrolled_id": enrollment.enrolled_id, "course_id": enrollment.course_id, **progress[enrollment.id]}
+        for enrollment in enrollments
+    ]
+
+
+def count_subquery(queryset, field="id", distinct=False):
+    """
+    COUNT(`field`) of `queryset` as a scalar subquery, for use in annotate().
+    """
+    template = "%(function)s(DISTINCT %(expressions)s)" if distinct else "%(function)s(%(expressions)s)"
+    counted = queryset.order_by().annotate(counted=models.Func(models.F(field), function="COUNT", template=template)).values("counted")
+    return models.functions.Coalesce(models.Subquery(counted), 0)
+
+
+def sum_subquery(queryset, field):
+    """
+    SUM(`field`) of `queryset` as a scalar subquery (0 when empty), for use in annotate().
+    """
+    output_field = queryset.model._meta.get_field(field)
+    summed = queryset.order_by().annotate(summed=models.Func(models.F(field), function="SUM", output_field=output_field)).values("summed")
+    return models.functions.Coalesce(models.Subquery(summed), models.Value(0), output_field=output_field)
+
 
 class StudentSummaryAPIView(generics.ListAPIView):
+    """
+    Dashboard counters and per-enrollment progress of a student. The three counters come from one query,
+    and the whole summary is cached briefly; enrollments, completed lessons and certificates of the
+    student invalidate it (see api/signals.py).
+    """
     serializer_class = api_serializers.StudentSummarySerializer
     permission_classes = [AllowAny]
 
     def get_queryset(self):
         user_id = self.kwargs['user_id']
-        user = User.objects.get(id=user_id)
-
-        total_courses = api_models.EnrolledCourse.objects.filter(user=user).count()
-        completed_lessons = api_models.CompletedLesson.objects.filter(user=user).count()
-        achieved_certificates = api_models.Certificate.objects.filter(user=user).count()
+        key = versioned_key(student_version(user_id), "summary")
+        summary = cache.get(key)
+        if summary is None:
+            summary = self.compute_summary(user_id)
+            cache.set(key, summary, STUDENT_SUMMARY_TIMEOUT)
+        return [summary]
+
+    def compute_summary(self, user_id):
+        counters = User.objects.filter(id=user_id).annotate(
+            total_courses=count_subquery(api_models.EnrolledCourse.objects.filter(user=models.OuterRef("pk"))),
+            completed_lessons=count_subquery(api_models.CompletedLesson.objects.filter(user=models.OuterRef("pk"))),
+            achieved_certificates=count_subquery(api_models.Certificate.objects.filter(user=models.OuterRef("pk"))),
+        ).values("total_courses", "completed_lessons", "achieved_certificates").first()
+        if counters is None:
+            raise NotFound("User not found")
+
+        enrollments = list(api_models.EnrolledCourse.objects.filter(user_id=user_id).only("id", "user_id", "course_id", "enrolled_id"))
+        return {**counters, "progress": enrollment_progress(enrollments)}
 
-        return [{
-            "total_courses": total_courses,
-            "completed_lessons": completed_lessons,
-            "achieved_certificates": achieved_certificates,
-        }]
-    
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
         serializer = self.get_serializer(queryset, many=True) # grab the serializer in serializer_class
@@ -600,30 +767,180 @@ class StudentSummaryAPIView(generics.ListAPIView):
         return Response(serializer.data)
 
 
-class StudentCourseAPIView(generics.ListAPIView):
+SYNC_TOKEN_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+# select_related() / prefetch_related() needed by each scalar field of EnrolledCourseSerializer (depth 3).
+# Users are rendered with their groups and permissions, hence the many-to-many prefetches.
+ENROLLMENT_SELECT_RELATED = {
+    "user": ("user",),
+    "teacher": ("teacher__user",),
+    "order_item": ("order_item__order__student", "order_item__teacher__user", "order_item__course__category", "order_item__course__teacher"),
+    "course": ("course__category", "course__teacher__user"),
+}
+ENROLLMENT_PREFETCH_RELATED = {
+    "user": ("user__groups__permissions", "user__user_permissions"),
+    "teacher": ("teacher__user__groups__permissions", "teacher__user__user_permissions"),
+    "order_item": (
+        models.Prefetch("order_item__coupons", queryset=api_models.Coupon.objects.select_related("teacher")),
+        "order_item__order__teacher", "order_item__order__coupons",
+        "order_item__order__student__groups", "order_item__order__student__user_permissions",
+        "order_item__teacher__user__groups", "order_item__teacher__user__user_permissions",
+    ),
+    "course": ("course__teacher__user__groups", "course__teacher__user__user_permissions"),
+}
+
+
+def csv_param(request, name):
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return {item.strip() for item in value.split(",") if item.strip()}
+
+
+class EnrollmentFieldsMixin:
+    """
+    ?fields=id,course,... limits the serialized fields and ?expand=curriculum,note,... picks the nested
+    relations to include (an empty ?expand= drops them all). Without ?expand= every relation of the
+    original response is included. Only the relations that end up in the output are queried, one query per relation.
+    """
+    default_expand = tuple(api_models.ENROLLMENT_RELATIONS)
+    sync_since = None
+
+    def get_requested_fields(self):
+        fields = csv_param(self.request, "fields")
+        if fields is None and self.sync_since is not None:
+            fields = {"id", "enrolled_id", "progress", *api_serializers.ENROLLMENT_EXPANDABLE_FIELDS}
+        return fields
+
+    def get_expand(self):
+        expand = csv_param(self.request, "expand")
+        if expand is None:
+            expand = set(self.default_expand)
+        fields = self.get_requested_fields()
+        return {
+            name for name in api_serializers.ENROLLMENT_EXPANDABLE_FIELDS
+            if name in expand and (fields is None or name in fields)
+        }
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_requested_fields()
+        context["expand"] = self.get_expand()
+        return context
+
+    def enrollment_queryset(self):
+        fields = self.get_requested_fields()
+        requested = [name for name in ENROLLMENT_SELECT_RELATED if fields is None or name in fields]
+        return api_models.EnrolledCourse.objects.select_related(
+            *[path for name in requested for path in ENROLLMENT_SELECT_RELATED[name]]
+        ).prefetch_related(
+            *[path for name in requested for path in ENROLLMENT_PREFETCH_RELATED[name]]
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        if args:
+            enrollments = list(args[0]) if kwargs.get("many") else [args[0]]
+            expand = self.get_expand()
+            api_models.EnrolledCourse.load_related(
+                enrollments, [name for name in expand if name in api_models.ENROLLMENT_RELATIONS], since=self.sync_since
+            )
+            if "resume_positions" in expand:
+                api_models.EnrolledCourse.load_resume_positions(enrollments)
+            fields = self.get_requested_fields()
+            if fields is None or "progress" in fields:
+                api_models.EnrolledCourse.load_progress(enrollments)
+            if kwargs.get("many"):
+                args = (enrollments, *args[1:])
+        return super().get_serializer(*args, **kwargs)
+
+
+class StudentCourseAPIView(EnrollmentFieldsMixin, generics.ListAPIView):
+    """
+    Enrollments of a student, with their nested relations unless ?fields= / ?expand= narrow them down.
+    """
     serializer_class = api_serializers.EnrolledCourseSerializer
     permission_classes = [AllowAny]
 
     def get_queryset(self):
         user_id = self.kwargs['user_id']
         user = User.objects.get(id=user_id)
-        return api_models.EnrolledCourse.objects.filter(user=user)
+        return self.enrollment_queryset().filter(user=user)
 
 
-class StudentDetailAPIView(generics.RetrieveAPIView):
+class StudentDetailAPIView(EnrollmentFieldsMixin, generics.RetrieveAPIView):
+    """
+    One enrollment of a student, with every nested relation unless ?expand= narrows them down.
+
+    Every response carries a `sync_token`. Passing it back as ?since= returns only the nested objects
+    changed since then, plus a `deleted` map ({relation: [id, ...]}) of the ones removed since then.
+    A token older than SyncTombstone.RETENTION gets a full response (with "full_sync": true).
+    """
     serializer_class = api_serializers.EnrolledCourseSerializer
     permission_classes = [AllowAny]
     lookup_field = "enrolled_id"
+    default_expand = api_serializers.ENROLLMENT_EXPANDABLE_FIELDS
 
     def get_object(self):
         user_id = self.kwargs['user_id']
         enrolled_id = self.kwargs['enrollment_id']
 
         user = User.objects.get(id=user_id)
-        enrollment = api_models.EnrolledCourse.objects.get(enrolled_id=enrolled_id, user=user)
+        enrollment = self.enrollment_queryset().get(enrolled_id=enrolled_id, user=user)
 
         return enrollment
 
+    def retrieve(self, request, *args, **kwargs):
+        sync_token = timezone.now()
+        since = self.parse_since()
+        full_sync = since is not None and since < sync_token - api_models.SyncTombstone.RETENTION
+        if not full_sync:
+            self.sync_since = since
+
+        enrollment = self.get_object()
+        data = self.get_serializer(enrollment).data
+        if self.sync_since is not None:
+            data["deleted"] = self.deleted_since(enrollment, self.sync_since)
+        elif since is not None:
+            data["full_sync"] = True
+        data["sync_token"] = sync_token.strftime(SYNC_TOKEN_FORMAT)
+        return Response(data)
+
+    def parse_since(self):
+        value = self.request.query_params.get("since")
+        if not value:
+            return None
+        since = parse_datetime(value)
+        if since is None:
+            raise ValidationError({"since": "Expected a sync_token or an ISO 8601 timestamp."})
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    def deleted_since(self, enrollment, since):
+        expand = self.get_expand()
+        deleted = {name: [] for name in expand if name in api_models.ENROLLMENT_RELATIONS}
+        tombstones = api_models.SyncTombstone.objects.filter(
+            models.Q(user_id__isnull=True) | models.Q(user_id=enrollment.user_id),
+            course_id=enrollment.course_id,
+            deleted_at__gte=since,
+            relation__in=list(deleted),
+        ).values_list("relation", "object_id")
+        for relation, object_id in tombstones:
+            deleted[relation].append(object_id)
+        return deleted
+
+
+class StudentCertificateListAPIView(generics.ListAPIView):
+    """
+    Certificates of a student with the URLs of their rendered files.
+    """
+    serializer_class = api_serializers.CertificateSerializer
+    permission_classes = [AllowAny]
+
+    def get_queryset(self):
+        return api_models.Certificate.objects.filter(user_id=self.kwargs['user_id'])
+
 
 class StudentCourseCompletedCreateAPIView(generics.CreateAPIView):
     serializer_class = api_serializers.CompletedLessonSerializer
@@ -652,18 +969,110 @@ class StudentCourseCompletedCreateAPIView(generics.CreateAPIView):
             return Response({"message": "Course marked as completed"})
 
 
+class StudentCourseCompletedBatchAPIView(generics.GenericAPIView):
+    """
+    Applies a batch of {variant_item_id, completed, timestamp} operations (e.g. progress recorded offline)
+    in one transaction and returns the progress of the affected enrollments.
+    Operations are idempotent: only the latest operation per lesson counts, and a completion
+    recorded after an operation's timestamp is not undone by it.
+    """
+    serializer_class = api_serializers.LessonCompletionBatchSerializer
+    permission_classes = [AllowAny]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_id = serializer.validated_data['user_id']
+        if not User.objects.filter(id=user_id).exists():
+            raise NotFound("User not found")
+
+        now = timezone.now()
+        latest = {}
+        for operation in sorted(serializer.validated_data['operations'], key=lambda operation: operation.get('timestamp') or now):
+            latest[operation['variant_item_id']] = operation
+
+        items = {
+            variant_item_id: (pk, course_id)
+            for variant_item_id, pk, course_id in api_models.VariantItem.objects.filter(
+                variant_item_id__in=latest
+            ).values_list("variant_item_id", "id", "variant__course_id")
+        }
+
+        with transaction.atomic():
+            existing = {
+                variant_item: (pk, date)
+                for pk, variant_item, date in api_models.CompletedLesson.objects.select_for_update().filter(
+                    user_id=user_id, variant_item_id__in=[pk for pk, _ in items.values()]
+                ).values_list("id", "variant_item_id", "date")
+            }
+            created, deleted = [], []
+            for variant_item_id, operation in latest.items():
+                if variant_item_id not in items:
+                    continue
+                pk, course_id = items[variant_item_id]
+                timestamp = operation.get('timestamp') or now
+                if operation['completed'] and pk not in existing:
+                    created.append(api_models.CompletedLesson(user_id=user_id, variant_item_id=pk, course_id=course_id, date=timestamp))
+                elif not operation['completed'] and pk in existing and existing[pk][1] <= timestamp:
+                    deleted.append(existing[pk][0])
+
+            api_models.CompletedLesson.objects.bulk_create(created, ignore_conflicts=True)
+            if deleted:
+                api_models.CompletedLesson.objects.filter(id__in=deleted).delete()
+        # bulk_create() does not send post_save, so the summary cache is invalidated here.
+        if created:
+            bump_version(student_version(user_id))
+
+        enrollments = list(api_models.EnrolledCourse.objects.filter(
+            user_id=user_id, course_id__in={course_id for _, course_id in items.values()}
+        ).only("id", "user_id", "course_id", "enrolled_id"))
+        if created:
+            issue_certificates(enrollments)
+
+        return Response({
+            "completed": len(created),
+            "uncompleted": len(deleted),
+            "unknown": [variant_item_id for variant_item_id in latest if variant_item_id not in items],
+            "progress": api_serializers.StudentCourseProgressSerializer(enrollment_progress(enrollments), many=True).data,
+        })
+
+
+class StudentPlaybackHeartbeatAPIView(generics.GenericAPIView):
+    """
+    Records where a student is in a lecture video. Heartbeats are buffered in the cache (no database
+    write per request) and flushed in batches; see api/playback.py.
+    """
+    serializer_class = api_serializers.PlaybackHeartbeatSerializer
+    permission_classes = [AllowAny]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        playback.record_heartbeat(**serializer.validated_data)
+        if playback.flush_due():
+            playback.flush()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class StudentNoteCreateAPIView(generics.ListCreateAPIView):
+    """
+    Notes of a student for one enrolled course, newest first and paginated.
+    """
     serializer_class = api_serializers.NoteSerializer
     permission_classes = [AllowAny]
+    pagination_class = NoteCursorPagination
 
     def get_queryset(self):
         user_id = self.kwargs['user_id']
         enrollment_id = self.kwargs['enrollment_id']
 
-        user = User.objects.get(id=user_id)
-        enrollmed = api_models.EnrolledCourse.objects.get(enrolled_id=enrollment_id)
+        course_id = api_models.EnrolledCourse.objects.filter(
+            enrolled_id=enrollment_id, user_id=user_id
+        ).values_list("course_id", flat=True).first()
+        if course_id is None:
+            raise NotFound("Enrollment not found")
 
-        return api_models.Note.objects.get(user=user, course=enrollmed.course)
+        return api_models.Note.objects.filter(user_id=user_id, course_id=course_id)
 
     def create(self, request, *args, **kwargs):
         user_id = request.data['user_id']
@@ -679,6 +1088,37 @@ class StudentNoteCreateAPIView(generics.ListCreateAPIView):
         return Response({"message": "Note created successfully"}, status=status.HTTP_201_CREATED)
 
 
+class StudentNoteSearchAPIView(generics.ListAPIView):
+    """
+    Full-text search over the title and text of all the notes of a student, best match first.
+    An empty query lists the newest notes.
+    """
+    serializer_class = api_serializers.NoteSerializer
+    permission_classes = [AllowAny]
+    pagination_class = NoteCursorPagination
+
+    @property
+    def keyset_ordering(self):
+        if self.request.GET.get('query', '').strip():
+            return ("-relevance", "-id")
+        return NoteCursorPagination.ordering
+
+    def get_queryset(self):
+        user_id = self.kwargs['user_id']
+        query = self.request.GET.get('query', '')
+        notes = api_models.Note.objects.filter(user_id=user_id)
+        if not query.strip():
+            return notes
+
+        results = get_note_search_backend().search(query, scope=user_id)
+        relevance = models.Case(
+            *[models.When(id=note_id, then=models.Value(score)) for note_id, score in results],
+            default=models.Value(0.0),
+            output_field=models.FloatField(),
+        )
+        return notes.filter(id__in=[note_id for note_id, _ in results]).annotate(relevance=relevance)
+
+
 class StudentDetailNoteAPIView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = api_serializers.NoteSerializer
     permission_classes = [AllowAny]
@@ -742,34 +1182,101 @@ class StudentWishListListAPIView(generics.ListCreateAPIView):
 
         return api_models.Wishlist.objects.filter(user=user)
 
+    def list(self, request, *args, **kwargs):
+        wishlist = list(self.get_queryset().values("id", "date", "course_id"))
+        cards = api_models.Course.objects.filter(id__in=[item["course_id"] for item in wishlist]).cards()
+        cards_by_id = {card["id"]: card for card in cards}
+
+        data = [
+            {"id": item["id"], "date": item["date"], "course": cards_by_id[item["course_id"]]}
+            for item in wishlist
+        ]
+        serializer = api_serializers.WishlistCardSerializer(data, many=True, context=self.get_serializer_context())
+
+        return Response(serializer.data)
+
     def create(self, request, *args, **kwargs):
         user_id = request.data['user_id']
         course_id = request.data['course_id']
 
         user = User.objects.get(id=user_id)
         course = api_models.Course.objects.get(id=course_id)
-        wishlist = api_models.Wishlist.objects.filter(user=user, course=course).first()
+        deleted, _ = api_models.Wishlist.objects.filter(user=user, course=course).delete()
 
-        if wishlist:
-            wishlist.delete()
+        if deleted:
             return Response({"message": "Wishlist Deleted"}, status=status.HTTP_200_OK)
         else:
-            api_models.Wishlist.objects.create(
+            # get_or_create() + the unique constraint keep concurrent toggles from adding the course twice.
+            api_models.Wishlist.objects.get_or_create(
                 user=user,
                 course=course
             )
             return Response({"message": "Wishlist created successfully"}, status=status.HTTP_201_CREATED)
 
 
+class StudentWishListMembershipAPIView(generics.GenericAPIView):
+    """
+    Which of ?course_ids=1,2,3 are in the wishlist of a student, answered with one indexed query.
+    """
+    permission_classes = [AllowAny]
+    max_course_ids = 500
+
+    def get(self, request, *args, **kwargs):
+        user_id = self.kwargs['user_id']
+        try:
+            course_ids = [int(course_id) for course_id in request.GET.get('course_ids', '').split(',') if course_id.strip()]
+        except ValueError:
+            return Response({"message": "course_ids must be a comma separated list of ids"}, status=status.HTTP_400_BAD_REQUEST)
+        course_ids = course_ids[:self.max_course_ids]
+
+        wishlisted = set(
+            api_models.Wishlist.objects.filter(user_id=user_id, course_id__in=course_ids).values_list("course_id", flat=True)
+        ) if course_ids else set()
+
+        return Response({str(course_id): course_id in wishlisted for course_id in course_ids})
+
+
+class StudentWishListBulkAPIView(generics.GenericAPIView):
+    """
+    Adds and removes many courses to/from the wishlist of a student: {"add": [course_id, ...], "remove": [...]}.
+    Adding a course that is already in the wishlist (or removing one that is not) is a no-op.
+    """
+    serializer_class = api_serializers.WishlistBulkSerializer
+    permission_classes = [AllowAny]
+
+    def post(self, request, *args, **kwargs):
+        user_id = self.kwargs['user_id']
+        if not User.objects.filter(id=user_id).exists():
+            raise NotFound("User not found")
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        add = set(serializer.validated_data['add'])
+        remove = set(serializer.validated_data['remove']) - add
+
+        with transaction.atomic():
+            existing = set(api_models.Wishlist.objects.filter(user_id=user_id, course_id__in=add).values_list("course_id", flat=True))
+            course_ids = set(api_models.Course.objects.filter(id__in=add - existing).values_list("id", flat=True))
+            api_models.Wishlist.objects.bulk_create(
+                [api_models.Wishlist(user_id=user_id, course_id=course_id) for course_id in course_ids],
+                ignore_conflicts=True,
+            )
+            removed = api_models.Wishlist.objects.filter(user_id=user_id, course_id__in=remove).delete()[0] if remove else 0
+
+        return Response({"added": len(course_ids), "removed": removed})
+
+
 class QuestionAnswerListAPIView(generics.ListCreateAPIView):
-    serializer_class = api_serializers.Question_AnswerSerializer
+    """
+    Q&A threads of a course, most recently active first (cursor pagination).
+    Each thread carries its first messages; longer threads are paged with QuestionAnswerMessageListAPIView.
+    """
+    serializer_class = api_serializers.QuestionThreadSerializer
     permission_classes = [AllowAny]
+    pagination_class = QuestionCursorPagination
 
     def get_queryset(self):
         course_id = self.kwargs['course_id']
-        course = api_models.Course.objects.get(id=course_id)
-
-        return api_models.Question_Answer.objects.filter(course=course)
+        return api_models.Question_Answer.objects.filter(course_id=course_id).threads()
     
     def create(self, request, *args, **kwargs):
         course_id = request.data['course_id']
@@ -816,11 +1323,30 @@ class QuestionAnswerMssageSendAPIView(generics.CreateAPIView):
             question=question
         )
 
+        question = api_models.Question_Answer.objects.select_related("user__profile").prefetch_related(
+            models.Prefetch(
+                "question_answer_message_set",
+                queryset=api_models.Question_Answer_Message.objects.select_related("user__profile"),
+            )
+        ).get(pk=question.pk)
         question_serializer = api_serializers.Question_AnswerSerializer(question)
 
         return Response({"message": "Message Sent", "question": question_serializer.data})
 
 
+class QuestionAnswerMessageListAPIView(generics.ListAPIView):
+    """
+    Messages of a Q&A thread in conversation order (cursor pagination).
+    """
+    serializer_class = api_serializers.Question_Answer_MessageSerializer
+    permission_classes = [AllowAny]
+    pagination_class = MessageCursorPagination
+
+    def get_queryset(self):
+        qa_id = self.kwargs['qa_id']
+        return api_models.Question_Answer_Message.objects.filter(question__qa_id=qa_id).select_related("user__profile")
+
+
 class ProfileAPIView(generics.RetrieveUpdateAPIView):
     serializer_class = api_serializers.ProfileSerializer
     permission_classes = [AllowAny]
@@ -835,44 +1361,37 @@ class ProfileAPIView(generics.RetrieveUpdateAPIView):
 
 
 class TeacherSummaryAPIView(generics.ListAPIView):
+    """
+    Dashboard counters of a teacher, computed in one query and cached briefly. Enrollments, order items,
+    payments and courses of the teacher invalidate it (see api/signals.py); the timeout bounds how
+    stale the trailing 28-day revenue can get.
+    """
     serializer_class = api_serializers.TeacherSummarySerializer
     permission_classes = [AllowAny]
 
     def get_queryset(self):
         teacher_id = self.kwargs['teacher_id']
-        teacher = api_models.Teacher.objects.get(id=teacher_id)
-
-        one_month_ago = datetime.today() - timedelta(days=28)
-
-        total_courses = api_models.Course.objects.filter(teacher=teacher).count()
+        key = versioned_key(teacher_version(teacher_id), "summary")
+        summary = cache.get(key)
+        if summary is None:
+            summary = self.compute_summary(teacher_id)
+            cache.set(key, summary, TEACHER_SUMMARY_TIMEOUT)
+        return [summary]
+
+    def compute_summary(self, teacher_id):
+        one_month_ago = timezone.now() - timedelta(days=28)
         # order__payment_status meaning is directly to field payment_status on model order
-        total_revenue = api_models.CartOrderItem.objects.filter(teacher=teacher, order__payment_status="Paid").aggregate(total_revenue=models.Sum("price"))["total_revenue"] or 0
-        monthly_revenue = api_models.CartOrderItem.objects.filter(teacher=teacher, order__payment_status="Paid", date__gte=one_month_ago).aggregate(total_revenue=models.Sum("price"))["total_revenue"] or 0
-
-        enrolled_courses = api_models.EnrolledCourse.objects.filter(teacher=teacher)
-        unique_student_id = set()
-        students = []
-
-        for course in enrolled_courses:
-            if course.user_id not in unique_student_id:
-                user = User.objects.get(id=course.user_id)
-                student = {
-                    "full_name": user.profile.full_name,
-                    "image": user.profile.image.url,
-                    "country": user.profile.country,
-                    "date": course.date,
-                }   
-
-                students.append(student)
-                unique_student_id.add(course.user_id)
-
-        return [{
-            "total_courses": total_courses,
-            "total_students": len(students),
-            "total_revenue": total_revenue,
-            "monthly_revenue": monthly_revenue,
-        }]
-    
+        paid_items = api_models.CartOrderItem.objects.filter(teacher=models.OuterRef("pk"), order__payment_status="Paid")
+        summary = api_models.Teacher.objects.filter(id=teacher_id).annotate(
+            total_courses=count_subquery(api_models.Course.objects.filter(teacher=models.OuterRef("pk"))),
+            total_students=count_subquery(api_models.EnrolledCourse.objects.filter(teacher=models.OuterRef("pk")), "user_id", distinct=True),
+            total_revenue=sum_subquery(paid_items, "price"),
+            monthly_revenue=sum_subquery(paid_items.filter(date__gte=one_month_ago), "price"),
+        ).values("total_courses", "total_students", "total_revenue", "monthly_revenue").first()
+        if summary is None:
+            raise NotFound("Teacher not found")
+        return summary
+
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
         serializer = self.get_serializer(queryset, many=True) # grab the serializer in serializer_class
@@ -881,14 +1400,32 @@ class TeacherSummaryAPIView(generics.ListAPIView):
 
 
 class TeacherCourseAPIView(generics.ListAPIView):
-    serializer_class = api_serializers.CourseSerializer
+    serializer_class = api_serializers.CourseCardSerializer
     permission_classes = [AllowAny]
 
     def get_queryset(self):
         teacher_id = self.kwargs['teacher_id']
         teacher = api_models.Teacher.objects.get(id=teacher_id)
 
-        return api_models.Course.objects.filter(teacher=teacher)
+        return api_models.Course.objects.filter(teacher=teacher).cards()
+
+
+class TeacherCourseEnrollmentListAPIView(generics.ListAPIView):
+    """
+    Paginated enrollments of one of the authenticated teacher's courses, newest first.
+    """
+    serializer_class = api_serializers.CourseEnrollmentSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    pagination_class = EnrollmentCursorPagination
+
+    def get_queryset(self):
+        course_id = self.kwargs['course_id']
+        course = api_models.Course.objects.filter(course_id=course_id, teacher__user=self.request.user).first()
+        if course is None:
+            raise NotFound("Course not found")
+
+        return api_models.EnrolledCourse.objects.filter(course=course).select_related("user__profile")
 
 
 class TeacherReviewListAPIView(generics.ListAPIView):
@@ -915,56 +1452,153 @@ class TeacherReviewDetailAPIView(generics.RetrieveUpdateAPIView):
         return api_models.Review.objects.get(course__teacher=teacher, id=review_id)
 
 
-class TeacherStudentListAPIView(viewsets.ViewSet):
-    # Write own custom query
-    def list(self, request, teacher_id=None):
-        teacher = api_models.Teacher.objects.get(id=teacher_id)
+def date_subquery(queryset, function="MAX", field="date"):
+    """
+    MAX (or MIN) of a datetime `field` of `queryset` as a scalar subquery, for use in annotate().
+    """
+    dates = queryset.order_by().annotate(
+        aggregated=models.Func(models.F(field), function=function, output_field=models.DateTimeField())
+    ).values("aggregated")
+    return models.Subquery(dates, output_field=models.DateTimeField())
+
 
-        enrolled_courses = api_models.EnrolledCourse.objects.filter(teacher=teacher)
-        unique_student_id = set()
-        students = []
+STUDENT_ROSTER_ORDERINGS = ("first_enrolled", "-first_enrolled", "last_active", "-last_active")
 
-        for course in enrolled_courses:
-            if course.user_id not in unique_student_id:
-                user = User.objects.get(id=course.user_id)
-                student = {
-                    "full_name": user.profile.full_name,
-                    "image": user.profile.image.url,
-                    "country": user.profile.country,
-                    "date": course.date,
-                }   
 
-                students.append(student)
-                unique_student_id.add(course.user_id)
+class TeacherStudentListAPIView(generics.ListAPIView):
+    """
+    Distinct students enrolled in the teacher's courses (cursor pagination), built in one query over
+    their profiles. ?search= matches the name or country; ?ordering= is one of STUDENT_ROSTER_ORDERINGS
+    (default -last_active). The last activity is the latest completed lesson or lecture playback in the
+    teacher's courses, or the latest enrollment.
+    """
+    serializer_class = api_serializers.TeacherStudentSerializer
+    permission_classes = [AllowAny]
+    pagination_class = StudentRosterCursorPagination
+
+    @property
+    def keyset_ordering(self):
+        ordering = self.request.GET.get('ordering', '-last_active')
+        if ordering not in STUDENT_ROSTER_ORDERINGS:
+            raise ValidationError({"ordering": f"Expected one of: {', '.join(STUDENT_ROSTER_ORDERINGS)}."})
+        return (ordering, "-id" if ordering.startswith("-") else "id")
+
+    def get_queryset(self):
+        teacher_id = self.kwargs['teacher_id']
+        student = models.OuterRef("user_id")
+        enrollments = api_models.EnrolledCourse.objects.filter(teacher_id=teacher_id, user=student)
+        latest_enrolled = date_subquery(enrollments)
+        latest_lesson = date_subquery(api_models.CompletedLesson.objects.filter(course__teacher_id=teacher_id, user=student))
+        latest_playback = date_subquery(
+            api_models.PlaybackPosition.objects.filter(variant_item__variant__course__teacher_id=teacher_id, user=student)
+        )
+
+        profiles = Profile.objects.filter(
+            user__in=api_models.EnrolledCourse.objects.filter(teacher_id=teacher_id).values("user_id")
+        ).annotate(
+            first_enrolled=date_subquery(enrollments, function="MIN"),
+            latest_enrolled=latest_enrolled,
+            last_active=models.functions.Greatest(
+                models.functions.Coalesce(latest_lesson, latest_enrolled),
+                models.functions.Coalesce(latest_playback, latest_enrolled),
+            ),
+        )
+
+        search = self.request.GET.get('search', '').strip()
+        if search:
+            profiles = profiles.filter(models.Q(full_name__icontains=search) | models.Q(country__icontains=search))
+        return profiles
 
-        return Response(students)
+
+REVENUE_GRANULARITIES = {
+    "day": TruncDay,
+    "week": TruncWeek,
+    "month": TruncMonth,
+    "year": TruncYear,
+}
+
+
+def teacher_revenue_rows(request, teacher_id):
+    """
+    CourseDailyRevenue rows of a teacher within the optional ?start= and ?end= dates (inclusive, YYYY-MM-DD).
+    """
+    if not api_models.Teacher.objects.filter(id=teacher_id).exists():
+        raise NotFound("Teacher not found")
+    rows = api_models.CourseDailyRevenue.objects.filter(teacher_id=teacher_id)
+    for name, lookup in (("start", "day__gte"), ("end", "day__lte")):
+        value = request.query_params.get(name)
+        if not value:
+            continue
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise ValidationError({name: "Expected a date (YYYY-MM-DD)."})
+        rows = rows.filter(**{lookup: day})
+    return rows
 
 
 @api_view(["GET"])
 def TeacherAllMonthEarningAPIView(request, teacher_id):
-    teacher = api_models.Teacher.objects.get(id=teacher_id)
+    """
+    Earnings of a teacher per period, oldest first, read from the daily revenue rollup.
+    ?granularity= is day, week, month (default) or year; ?start= / ?end= restrict the range.
+    Each period is identified by the date it starts on, so months of different years stay apart.
+    """
+    granularity = request.query_params.get("granularity", "month")
+    if granularity not in REVENUE_GRANULARITIES:
+        raise ValidationError({"granularity": f"Expected one of: {', '.join(REVENUE_GRANULARITIES)}."})
+
+    earnings = teacher_revenue_rows(request, teacher_id).annotate(
+        period=REVENUE_GRANULARITIES[granularity]("day")
+    ).values("period").annotate(total_earning=models.Sum("revenue"), sales=models.Sum("sales")).order_by("period")
 
-    monthly_earning_tracker = api_models.CartOrderItem.objects.filter(teacher=teacher, order__payment_status="Paid").annotate(month=ExtractMonth("date")).values("month").annotate(total_earning=models.Sum("price")).order_by("month")
+    monthly_earning_tracker = [
+        {**row, "year": row["period"].year, "month": row["period"].month} if granularity == "month" else row
+        for row in earnings
+    ]
 
     return Response(monthly_earning_tracker)
 
 
-class TeacherBestSellingCourseAPIView(viewsets.ViewSet):
-    def list(self, request, teacher_id=None):
-        teacher = api_models.Teacher.objects.get(id=teacher_id)
-        courses_with_total_price = []
-        courses = api_models.Course.objects.filter(teacher=teacher) 
+BEST_SELLING_ORDERINGS = ("revenue", "-revenue", "sales", "-sales")
 
-        for course in courses:
-            revenue = course.enrolledcourse_set.aggregate(total_price=models.Sum('order_item__price'))['total_price'] or 0
-            sales = course.enrolledcourse_set.count()
 
-            courses_with_total_price.append({
+class TeacherBestSellingCourseAPIView(viewsets.ViewSet):
+    """
+    Revenue and sales per course of a teacher, read from the daily revenue rollup in one query.
+    Accepts the same ?start= / ?end= range as TeacherAllMonthEarningAPIView, an ?ordering= of
+    BEST_SELLING_ORDERINGS (default -revenue) and a ?limit= for the top K courses.
+    """
+    def list(self, request, teacher_id=None):
+        ordering = request.query_params.get("ordering", "-revenue")
+        if ordering not in BEST_SELLING_ORDERINGS:
+            raise ValidationError({"ordering": f"Expected one of: {', '.join(BEST_SELLING_ORDERINGS)}."})
+        limit = request.query_params.get("limit")
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = 0
+            if limit < 1:
+                raise ValidationError({"limit": "Expected a positive integer."})
+
+        rows = teacher_revenue_rows(request, teacher_id).filter(course=models.OuterRef("pk"))
+        courses = api_models.Course.objects.filter(teacher_id=teacher_id).only("id", "image", "title").annotate(
+            revenue=sum_subquery(rows, "revenue"),
+            sales=sum_subquery(rows, "sales"),
+        ).order_by(ordering, "id")[:limit]
+
+        courses_with_total_price = [
+            {
                 'course_image': course.image.url,
                 "course_title": course.title,
-                "revenue": revenue,
-                "sales": sales
-            })
+                "revenue": course.revenue,
+                "sales": course.sales
+            }
+            for course in courses
+        ]
 
         return Response(courses_with_total_price)
     
@@ -980,15 +1614,70 @@ class TeacherCourseOrdersListAPIView(generics.ListAPIView):
         return api_models.CartOrderItem.objects.filter(teacher=teacher)
 
 
+class TeacherExportAPIView(generics.GenericAPIView):
+    """
+    Streams a flat export of the authenticated teacher's rows; other users get a 403. ?file_format= is
+    csv (default) or ndjson, and ?gzip=true compresses the stream. Subclasses set `columns`, `filename`
+    and get_queryset().
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    columns = ()
+    filename = "export"
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('file_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({"file_format": f"Expected one of: {', '.join(EXPORT_FORMATS)}."})
+        try:
+            compress = bool(strtobool(request.GET.get('gzip', 'false')))
+        except ValueError:
+            raise ValidationError({"gzip": "Expected a boolean."})
+
+        teacher_id = self.kwargs['teacher_id']
+        owner_id = api_models.Teacher.objects.filter(id=teacher_id).values_list("user_id", flat=True).first()
+        if owner_id is None:
+            raise NotFound("Teacher not found")
+        if owner_id != request.user.id:
+            raise PermissionDenied("You can only export your own data.")
+        return export_response(
+            self.get_queryset().order_by("date", "id"), self.columns, f"{self.filename}-{teacher_id}", export_format, compress
+        )
+
+
+class TeacherCourseOrdersExportAPIView(TeacherExportAPIView):
+    """
+    All order items of the teacher's courses, oldest first (see ORDER_EXPORT_COLUMNS).
+    """
+    columns = ORDER_EXPORT_COLUMNS
+    filename = "orders"
+
+    def get_queryset(self):
+        return api_models.CartOrderItem.objects.filter(teacher_id=self.kwargs['teacher_id'])
+
+
+class TeacherStudentExportAPIView(TeacherExportAPIView):
+    """
+    All enrollments in the teacher's courses, oldest first (see STUDENT_EXPORT_COLUMNS).
+    """
+    columns = STUDENT_EXPORT_COLUMNS
+    filename = "students"
+
+    def get_queryset(self):
+        return api_models.EnrolledCourse.objects.filter(teacher_id=self.kwargs['teacher_id'])
+
+
 class TeacherQuestionAnswerListAPIView(generics.ListAPIView):
-    serializer_class = api_serializers.Question_AnswerSerializer
+    """
+    Q&A threads of all the teacher's courses, most recently active first (cursor pagination).
+    """
+    serializer_class = api_serializers.QuestionThreadSerializer
     permission_classes = [AllowAny]
+    pagination_class = QuestionCursorPagination
 
     def get_queryset(self):
         teacher_id = self.kwargs['teacher_id']
-        teacher = api_models.Teacher.objects.get(id=teacher_id)
-
-        return api_models.Question_Answer.objects.filter(course__teacher=teacher)
+        return api_models.Question_Answer.objects.filter(course__teacher_id=teacher_id).threads()
 
 
 class TeacherCouponListCreateAPIView(generics.ListCreateAPIView):
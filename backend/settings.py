@@ -96,6 +96,43 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The default cache holds the versioned catalog responses; it is per process (LocMem) unless REDIS_URL
+# is set. The "playback" cache buffers lecture heartbeats until flush_playback_positions writes them,
+# so in multi-process deployments (several workers, or the flush command run from cron) it must be
+# Redis: a LocMem buffer is only seen by the process that filled it.
+
+REDIS_URL = env.str("REDIS_URL", None)
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+        'playback': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'playback',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'playback': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'playback',
+            'OPTIONS': {
+                # Culling evicts random keys, including the queue counters, so keep it rare.
+                'MAX_ENTRIES': 100000,
+            },
+        },
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 